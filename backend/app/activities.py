@@ -1,60 +1,183 @@
+import asyncio
+import contextvars
+import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from uuid import uuid4
 
 from temporalio import activity
 
-from .adk_client import analyze_application
-from .emailer import send_notification_email
+from .adk_client import (analyze_application, analyze_applications_batch,
+                         cache_screening_result, fallback_screen,
+                         prepare_screening)
+from .adk_tools import run_adk_evaluation, run_adk_intake
+from .emailer import send_notification_email, send_notification_emails
+from .metrics import record_screening
+from .prompt_builder import condense_resume
+from .resume_text import file_sha256, get_cached_text
 from .storage import (append_application_record, append_failed_record,
-                      get_unnotified_failed, mark_failed_notified)
+                      get_unnotified_failed, get_unnotified_failed_page,
+                      mark_failed_notified)
 
+logger = logging.getLogger(__name__)
 
-@activity.defn
-async def evaluate_application(payload: Dict) -> Dict:
+
+def _file_path(payload: Dict) -> Optional[Path]:
     file_path_raw: Optional[str] = payload.get("file_path")
-    file_path = Path(file_path_raw) if file_path_raw else None
-    analysis = await analyze_application(
-        email=payload["email"],
-        title=payload["title"],
-        description=payload["description"],
-        file_path=file_path,
-    )
+    return Path(file_path_raw) if file_path_raw else None
+
+
+def _resume_text_for_search(payload: Dict, file_path: Optional[Path]) -> str:
+    # Earlier stages already extracted the text, so this is a cache read, never a PDF parse.
+    if not file_path:
+        return ""
+    try:
+        content_hash = payload.get("resume_sha256") or file_sha256(file_path)
+    except OSError as exc:
+        logger.warning("Could not hash resume %s for the search index (%s)", file_path, exc)
+        return ""
+    return condense_resume(get_cached_text(content_hash) or "", budget_tokens=0)
+
 
+def _record_evaluation(payload: Dict, analysis: Dict, record_id: Optional[str] = None) -> None:
+    # Blocking (hashing, cache and SQLite I/O): activities call it through asyncio.to_thread.
+    record_screening(analysis)
+    file_path = _file_path(payload)
+    resume_text = _resume_text_for_search(payload, file_path)
     if analysis.get("qualifies"):
         append_application_record(
             {
+                "id": record_id or uuid4().hex,
                 "email": payload["email"],
                 "title": payload["title"],
                 "description": payload["description"],
                 "file_path": str(file_path) if file_path else "",
+                "source": payload.get("source"),
                 "evaluated_at": datetime.utcnow().isoformat() + "Z",
                 "analysis": analysis,
-            }
+            },
+            resume_text,
         )
 
     else:
         append_failed_record(
             {
-                "id": uuid4().hex,
+                "id": record_id or uuid4().hex,
                 "email": payload["email"],
                 "title": payload["title"],
                 "description": payload["description"],
                 "file_path": str(file_path) if file_path else "",
+                "source": payload.get("source"),
                 "evaluated_at": datetime.utcnow().isoformat() + "Z",
                 "analysis": analysis,
                 "notified_at": None,
-            }
+            },
+            resume_text,
         )
 
+
+@activity.defn
+async def evaluate_application(payload: Dict) -> Dict:
+    analysis = await analyze_application(
+        email=payload["email"],
+        title=payload["title"],
+        description=payload["description"],
+        file_path=_file_path(payload),
+        content_hash=payload.get("resume_sha256"),
+    )
+    await asyncio.to_thread(_record_evaluation, payload, analysis)
     return analysis
 
 
+@activity.defn
+async def prepare_application(payload: Dict) -> Dict:
+    
+    return await prepare_screening(
+        email=payload["email"],
+        title=payload["title"],
+        description=payload["description"],
+        file_path=_file_path(payload),
+        content_hash=payload.get("resume_sha256"),
+        resume_unreadable=bool(payload.get("resume_unreadable")),
+    )
+
+
+@activity.defn
+async def intake_application(payload: Dict) -> Dict:
+    
+    file_path = _file_path(payload)
+    return await run_adk_intake(
+        application_id=payload["email"],
+        email=payload["email"],
+        title=payload["title"],
+        description=payload["description"],
+        resume_path=str(file_path) if file_path else None,
+        resume_sha256=payload.get("resume_sha256"),
+    )
+
+
+@activity.defn
+async def evaluate_candidate(payload: Dict) -> Dict:
+    
+    file_path = _file_path(payload)
+    analysis = await run_adk_evaluation(
+        application_id=payload["email"],
+        email=payload["email"],
+        title=payload["title"],
+        description=payload["description"],
+        candidate_profile=payload["candidate_profile"],
+    )
+    analysis["file_path"] = str(file_path) if file_path else ""
+    return analysis
+
+
+@activity.defn
+async def fallback_screen_application(payload: Dict) -> Dict:
+    
+    return await fallback_screen(
+        title=payload["title"],
+        description=payload["description"],
+        file_path=_file_path(payload),
+        content_hash=payload.get("resume_sha256"),
+    )
+
+
+@activity.defn
+async def record_evaluation(payload: Dict) -> Dict:
+    
+    analysis = payload["analysis"]
+    await cache_screening_result(payload.get("cache_key"), analysis)
+    # record_id is stable across retries, so a retried write is ignored by the store.
+    await asyncio.to_thread(_record_evaluation, payload["application"], analysis, payload.get("record_id"))
+    return {"stored": True, "qualifies": bool(analysis.get("qualifies"))}
+
+
+@activity.defn
+async def evaluate_applications_batch(payload: Dict) -> Dict:
+    
+    applications: List[Dict] = payload["applications"]
+    record_ids: List[Optional[str]] = payload.get("record_ids") or [None] * len(applications)
+    analyses = await analyze_applications_batch(applications)
+    results: List[Dict] = []
+    for application, analysis, record_id in zip(applications, analyses, record_ids):
+        await asyncio.to_thread(_record_evaluation, application, analysis, record_id)
+        results.append(
+            {
+                "email": application["email"],
+                "qualifies": bool(analysis.get("qualifies")),
+                "reason": analysis.get("reason", ""),
+                "batched": bool(analysis.get("batched")),
+            }
+        )
+    return {"results": results}
+
+
 @activity.defn
 async def send_applicant_email(payload: Dict) -> Dict:
    
-    error = send_notification_email(
+    error = await asyncio.to_thread(
+        send_notification_email,
         to_email=payload["email"],
         subject=payload.get("subject", "Thanks for applying — you passed the initial screen"),
         body=payload.get(
@@ -69,9 +192,7 @@ async def send_applicant_email(payload: Dict) -> Dict:
     return {"sent": error is None, "error": error}
 
 
-@activity.defn
-async def send_failed_email(payload: Dict) -> Dict:
-    
+def _failed_email_message(payload: Dict) -> Dict:
     reason = payload.get("reason", "")
     body = payload.get(
         "body",
@@ -83,24 +204,84 @@ async def send_failed_email(payload: Dict) -> Dict:
             "We appreciate your interest and encourage you to reapply when it’s a closer fit.\n"
         ),
     )
-    error = send_notification_email(
-        to_email=payload["email"],
-        subject=payload.get("subject", "Thanks for applying — quick update"),
-        body=body,
+    return {
+        "email": payload["email"],
+        "subject": payload.get("subject", "Thanks for applying — quick update"),
+        "body": body,
+    }
+
+
+@activity.defn
+async def send_failed_email(payload: Dict) -> Dict:
+    
+    message = _failed_email_message(payload)
+    error = await asyncio.to_thread(
+        send_notification_email,
+        to_email=message["email"],
+        subject=message["subject"],
+        body=message["body"],
     )
     return {"sent": error is None, "error": error}
 
 
 @activity.defn
-async def fetch_unnotified_failed(_: Optional[Dict] = None) -> Dict:
+async def send_failed_emails_batch(payload: Dict) -> Dict:
     
-    rows = get_unnotified_failed()
-    return {"rows": rows}
+    rows = [row for row in payload.get("rows", []) if row.get("email")]
+    # A retry resumes after the last heartbeat instead of re-sending the whole batch.
+    progress: Dict = {"done": 0, "sent_ids": [], "failed": 0}
+    heartbeat_details = activity.info().heartbeat_details
+    if heartbeat_details:
+        progress.update(heartbeat_details[0])
+    pending = rows[progress["done"]:]
+    sent_before, failed_before = list(progress["sent_ids"]), progress["failed"]
+
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+
+    def on_result(index: int, error: Optional[str]) -> None:
+        # Runs on the sending thread; heartbeats must be issued from the event loop.
+        progress["done"] += 1
+        if error:
+            progress["failed"] += 1
+        elif pending[index].get("id"):
+            progress["sent_ids"].append(pending[index]["id"])
+        snapshot = {**progress, "sent_ids": list(progress["sent_ids"])}
+        loop.call_soon_threadsafe(activity.heartbeat, snapshot, context=context)
+
+    messages = [_failed_email_message(row) for row in pending]
+    errors = await asyncio.to_thread(send_notification_emails, messages, on_result)
+    # Count from the returned errors: on_result only checkpoints progress and is not called
+    # when the sender gives up early (SMTP unconfigured or unreachable).
+    sent_ids = sent_before + [row["id"] for row, error in zip(pending, errors) if not error and row.get("id")]
+    failed = failed_before + sum(1 for error in errors if error)
+    return {"sent_ids": sent_ids, "attempts": len(rows), "failed": failed}
+
+
+@activity.defn
+async def fetch_unnotified_failed(payload: Optional[Dict] = None) -> Dict:
+    
+    payload = payload or {}
+    limit = payload.get("limit")
+    if limit is None:
+        page = {"rows": await asyncio.to_thread(get_unnotified_failed), "next_cursor": None}
+    else:
+        page = await asyncio.to_thread(get_unnotified_failed_page, limit, payload.get("cursor"))
+    if payload.get("compact"):
+        # Keep workflow history small: only what the notification step needs.
+        page["rows"] = [
+            {
+                "id": row.get("id"),
+                "email": row.get("email"),
+                "reason": (row.get("analysis") or {}).get("reason", ""),
+            }
+            for row in page["rows"]
+        ]
+    return page
 
 
 @activity.defn
 async def mark_failed_as_notified(payload: Dict) -> Dict:
     
     ids = payload.get("ids", [])
-    mark_failed_notified(ids)
-    return {"updated": len(ids)}
+    return {"updated": await asyncio.to_thread(mark_failed_notified, ids)}
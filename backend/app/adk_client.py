@@ -1,33 +1,44 @@
 import asyncio
+import hashlib
 import json
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Dict, List, Optional
 
-from .adk_tools import run_adk_pipeline
-from .config import GEMINI_MODEL, GOOGLE_API_KEY
+from .adk_tools import prompt_fingerprint, run_adk_pipeline
+from .config import (BATCH_RESUME_CHARS, DESCRIPTION_TOKEN_BUDGET,
+                     GEMINI_EXECUTOR_THREADS, GEMINI_MODEL,
+                     GEMINI_TIMEOUT_SECONDS, GOOGLE_API_KEY,
+                     RESUME_TOKEN_BUDGET)
+from .llm_limiter import estimate_tokens, is_rate_limit_error, llm_limiter
+from .metrics import LLM_CALL_SECONDS, timed
+from .prescreen import keyword_screen, prescreen
+from .prompt_builder import (build_application_prompt, condense_resume,
+                             condense_text)
+from .result_cache import get_result_cache, screening_cache_key
+from .resume_text import extract_resume_text_async, file_sha256, store_cached_text
 
 logger = logging.getLogger(__name__)
-KEYWORDS = ["react", "node"]
+GEMINI_INSTRUCTIONS = (
+    "You are screening candidates for a Senior Full-Stack Developer role. Overall 3 years of experience can be assumed for the senior level candidate."
+    "Decide if the applicant is senior-level and explicitly mentions React, Node.js. "
+    "Respond with compact JSON: "
+    '{"qualifies":true|false,"reason":"string","missing_keywords":["react","node"]}'
+)
+GEMINI_BATCH_INSTRUCTIONS = (
+    "You are screening candidates for a Senior Full-Stack Developer role. Overall 3 years of experience can be assumed for the senior level candidate."
+    "You will receive a JSON array of applications, each with an integer index. "
+    "For each one, decide if the applicant is senior-level and explicitly mentions React, Node.js. "
+    "Respond with a compact JSON array holding exactly one object per application: "
+    '[{"index":0,"qualifies":true|false,"reason":"string","missing_keywords":["react","node"]}]'
+)
 
 
-def _extract_pdf_text(file_path: Optional[Path]) -> str:
-    if not file_path:
-        return ""
-    try:
-        from pypdf import PdfReader
-    except Exception as exc: 
-        logger.warning("pypdf not available for %s (%s)", file_path, exc)
-        return ""
-
-    try:
-        reader = PdfReader(str(file_path))
-        pages = [page.extract_text() or "" for page in reader.pages]
-        return "\n".join(pages)
-    except Exception as exc:  
-        logger.warning("Failed to extract PDF text from %s (%s)", file_path, exc)
-        return ""
+async def _extract_pdf_text(file_path: Optional[Path], content_hash: Optional[str] = None) -> str:
+    return await extract_resume_text_async(file_path, content_hash)
 
 
 def _parse_json_response(raw: str) -> Optional[Dict]:
@@ -48,29 +59,90 @@ def _parse_json_response(raw: str) -> Optional[Dict]:
     return None
 
 
-def _call_gemini(prompt: str) -> Optional[Dict]:
+def _parse_json_array_response(raw: str) -> List[Dict]:
+    raw = raw.strip()
+    raw = raw.strip("` \n")
+    if raw.lower().startswith("json"):
+        raw = raw[4:].strip()
+
     try:
+        value = json.loads(raw)
+        if isinstance(value, dict):
+            value = [value]
+        if isinstance(value, list):
+            return [row for row in value if isinstance(row, dict)]
+    except Exception:
+        pass
+
+    # Recover every complete object from a truncated or chatty response.
+    decoder = json.JSONDecoder()
+    rows: List[Dict] = []
+    position = 0
+    while True:
+        start = raw.find("{", position)
+        if start < 0:
+            return rows
+        try:
+            value, position = decoder.raw_decode(raw, start)
+        except ValueError:
+            position = start + 1
+            continue
+        if isinstance(value, dict):
+            rows.append(value)
+
+
+_gemini_model = None
+_gemini_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_gemini_model():
+    # Configured once per process; GenerativeModel is safe to share across calls.
+    global _gemini_model
+    if _gemini_model is None:
         import google.generativeai as genai
+
+        genai.configure(api_key=GOOGLE_API_KEY)
+        _gemini_model = genai.GenerativeModel(GEMINI_MODEL)
+    return _gemini_model
+
+
+def _get_gemini_executor() -> ThreadPoolExecutor:
+    global _gemini_executor
+    if _gemini_executor is None:
+        _gemini_executor = ThreadPoolExecutor(max_workers=GEMINI_EXECUTOR_THREADS, thread_name_prefix="gemini")
+    return _gemini_executor
+
+
+async def _gemini_generate(contents: List[str]) -> str:
+    # The deadline is enforced here: google-generativeai 0.3.x has no per-request timeout and
+    # rejects unknown keyword arguments such as request_options.
+    model = _get_gemini_model()
+    if hasattr(model, "generate_content_async"):
+        call = model.generate_content_async(contents)
+    else:
+        call = asyncio.get_running_loop().run_in_executor(
+            _get_gemini_executor(), partial(model.generate_content, contents)
+        )
+    response = await asyncio.wait_for(call, timeout=GEMINI_TIMEOUT_SECONDS)
+    return response.text.strip() if response and response.text else ""
+
+
+async def _call_gemini(prompt: str) -> Optional[Dict]:
+    try:
+        _get_gemini_model()
     except Exception as exc:
         logger.error("google-generativeai not installed or failed to import: %s", exc)
         return None
 
     try:
-        genai.configure(api_key=GOOGLE_API_KEY)
-        model = genai.GenerativeModel(GEMINI_MODEL)
-        instructions = (
-            "You are screening candidates for a Senior Full-Stack Developer role. Overall 3 years of experience can be assumed for the senior level candidate."
-            "Decide if the applicant is senior-level and explicitly mentions React, Node.js. "
-            "Respond with compact JSON: "
-            '{"qualifies":true|false,"reason":"string","missing_keywords":["react","node"]}'
-        )
-        response = model.generate_content(
-            [
-                instructions,
-                f"Application materials:\n{prompt}",
-            ]
-        )
-        raw = response.text.strip() if response and response.text else ""
+        with timed(LLM_CALL_SECONDS, stage="gemini", outcome="error") as labels:
+            raw = await _gemini_generate(
+                [
+                    GEMINI_INSTRUCTIONS,
+                    f"Application materials:\n{prompt}",
+                ]
+            )
+            labels["outcome"] = "ok"
         parsed = _parse_json_response(raw)
         if not parsed:
             logger.error("Gemini response not JSON parseable: %s", raw[:200])
@@ -78,34 +150,139 @@ def _call_gemini(prompt: str) -> Optional[Dict]:
         parsed["used_gemini"] = True
         return parsed
     except Exception as exc:  # noqa: BLE001 - best effort
-        logger.error("Gemini call failed (model=%s): %s", GEMINI_MODEL, exc)
+        if is_rate_limit_error(exc):
+            llm_limiter.report_throttled()
+        logger.error("Gemini call failed (model=%s): %r", GEMINI_MODEL, exc)
         return None
 
 
+async def _call_gemini_batch(prompt: str) -> List[Dict]:
+    try:
+        with timed(LLM_CALL_SECONDS, stage="gemini_batch", outcome="error") as labels:
+            raw = await _gemini_generate([GEMINI_BATCH_INSTRUCTIONS, f"Applications:\n{prompt}"])
+            labels["outcome"] = "ok"
+    except Exception as exc:  # noqa: BLE001 - entries fall back to single screening
+        if is_rate_limit_error(exc):
+            llm_limiter.report_throttled()
+        logger.error("Gemini batch call failed (model=%s): %r", GEMINI_MODEL, exc)
+        return []
+    rows = _parse_json_array_response(raw)
+    if not rows:
+        logger.error("Gemini batch response not JSON parseable: %s", raw[:200])
+    return rows
+
+
 def _keyword_screen(text_blob: str, file_path: Optional[Path]) -> Dict:
-    lowered = text_blob.lower()
-    missing_keywords: List[str] = [kw for kw in KEYWORDS if kw not in lowered]
-    senior_signal = "senior" in lowered or "sr" in lowered
-    qualifies = senior_signal and not missing_keywords
-    reason = (
-        "Matches senior full-stack criteria with React, Node.js."
-        if qualifies
-        else "Missing senior signal or required keywords."
+    return keyword_screen(text_blob, str(file_path) if file_path else "")
+
+
+@lru_cache(maxsize=1)
+def _screening_version() -> str:
+    material = "\n".join(
+        [
+            prompt_fingerprint(),
+            GEMINI_MODEL,
+            GEMINI_INSTRUCTIONS,
+            GEMINI_BATCH_INSTRUCTIONS,
+            f"budgets:{RESUME_TOKEN_BUDGET}/{DESCRIPTION_TOKEN_BUDGET}/{BATCH_RESUME_CHARS}",
+        ]
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+async def _resume_hash(file_path: Optional[Path], content_hash: Optional[str]) -> Optional[str]:
+    if not file_path or content_hash:
+        return content_hash
+    try:
+        return await asyncio.to_thread(file_sha256, file_path)
+    except OSError as exc:
+        logger.warning("Could not hash resume %s (%s)", file_path, exc)
+        return None
+
+
+async def prepare_screening(
+    email: str,
+    title: str,
+    description: str,
+    file_path: Optional[Path],
+    content_hash: Optional[str] = None,
+    resume_unreadable: bool = False,
+) -> Dict:
+    content_hash = await _resume_hash(file_path, content_hash)
+    if resume_unreadable and content_hash:
+        # Extraction already failed on every attempt: cache the content as unreadable so
+        # later stages skip the PDF too.
+        await asyncio.to_thread(store_cached_text, content_hash, "")
+        pdf_text = ""
+    elif resume_unreadable:
+        pdf_text = ""
+    else:
+        # Warms the resume text cache so later stages never re-parse the PDF.
+        pdf_text = await _extract_pdf_text(file_path, content_hash)
+    screened = prescreen(
+        "\n".join([title, description, pdf_text]),
+        str(file_path) if file_path else "",
+        resume_unreadable=bool(file_path) and not pdf_text.strip(),
     )
-    return {
-        "qualifies": qualifies,
-        "reason": reason,
-        "missing_keywords": missing_keywords,
-        "used_gemini": False,
-        "file_path": str(file_path) if file_path else "",
+    prepared: Dict = {
+        "content_hash": content_hash,
+        "cache_key": None,
+        "cached_analysis": None,
+        # A final pre-screen verdict: record it and skip every model call.
+        "prescreen_analysis": screened["analysis"],
+        "prescreen": screened["prescreen"],
+        "llm_enabled": bool(GOOGLE_API_KEY),
     }
+    if GOOGLE_API_KEY and screened["analysis"] is None:
+        cache_key = screening_cache_key(_screening_version(), email, title, description, content_hash or "")
+        cached = await asyncio.to_thread(get_result_cache().get, cache_key)
+        if cached:
+            cached["file_path"] = str(file_path) if file_path else ""
+        prepared["cache_key"] = cache_key
+        prepared["cached_analysis"] = cached
+    return prepared
 
 
-async def analyze_application(email: str, title: str, description: str, file_path: Optional[Path]) -> Dict:
-    pdf_text = _extract_pdf_text(file_path)
+async def fallback_screen(
+    title: str,
+    description: str,
+    file_path: Optional[Path],
+    content_hash: Optional[str] = None,
+) -> Dict:
+    pdf_text = await _extract_pdf_text(file_path, content_hash)
     combined = "\n".join([title, description, pdf_text])
-
     if GOOGLE_API_KEY:
+        prompt = build_application_prompt(title, description, pdf_text)
+        async with llm_limiter.slot(estimate_tokens(GEMINI_INSTRUCTIONS, prompt)):
+            gemini_result = await _call_gemini(prompt)
+        if gemini_result:
+            gemini_result["file_path"] = str(file_path)
+            return gemini_result
+        logger.warning("Falling back to keyword screen because Gemini returned no result.")
+    return _keyword_screen(combined, file_path)
+
+
+async def cache_screening_result(cache_key: Optional[str], analysis: Dict) -> None:
+    # Only model-produced results are cached; keyword fallbacks usually mean the model was unavailable.
+    if cache_key and analysis.get("used_gemini") and not analysis.get("cache_hit"):
+        await asyncio.to_thread(get_result_cache().put, cache_key, analysis)
+
+
+async def analyze_application(
+    email: str,
+    title: str,
+    description: str,
+    file_path: Optional[Path],
+    content_hash: Optional[str] = None,
+) -> Dict:
+    prepared = await prepare_screening(email, title, description, file_path, content_hash)
+    if prepared["prescreen_analysis"]:
+        return prepared["prescreen_analysis"]
+    if prepared["cached_analysis"]:
+        return prepared["cached_analysis"]
+    content_hash = prepared["content_hash"]
+
+    if prepared["llm_enabled"]:
         try:
             adk_result = await run_adk_pipeline(
                 application_id=email,
@@ -113,17 +290,96 @@ async def analyze_application(email: str, title: str, description: str, file_pat
                 title=title,
                 description=description,
                 resume_path=str(file_path) if file_path else None,
+                resume_sha256=content_hash,
             )
             if adk_result:
                 adk_result["file_path"] = str(file_path) if file_path else ""
+                await cache_screening_result(prepared["cache_key"], adk_result)
                 return adk_result
         except Exception as exc:  # noqa: BLE001
             logger.error("ADK screening failed so genai will be used: %s", exc)
 
-        gemini_result = await asyncio.to_thread(_call_gemini, combined)
-        if gemini_result:
-            gemini_result["file_path"] = str(file_path)
-            return gemini_result
-        logger.warning("Falling back to keyword screen because Gemini returned no result.")
+    result = await fallback_screen(title, description, file_path, content_hash)
+    await cache_screening_result(prepared["cache_key"], result)
+    return result
 
-    return _keyword_screen(combined, file_path)
+
+def _application_file_path(application: Dict) -> Optional[Path]:
+    return Path(application["file_path"]) if application.get("file_path") else None
+
+
+async def analyze_applications_batch(applications: List[Dict]) -> List[Dict]:
+    # Packs every uncached application into one Gemini request; entries the model
+    # skipped or mangled are re-screened one at a time with analyze_application.
+    results: List[Optional[Dict]] = [None] * len(applications)
+    prepared_list = await asyncio.gather(
+        *(
+            prepare_screening(
+                email=app["email"],
+                title=app["title"],
+                description=app["description"],
+                file_path=_application_file_path(app),
+                content_hash=app.get("resume_sha256"),
+            )
+            for app in applications
+        )
+    )
+
+    pending: List[int] = []
+    for index, prepared in enumerate(prepared_list):
+        if prepared["prescreen_analysis"] or prepared["cached_analysis"]:
+            results[index] = prepared["prescreen_analysis"] or prepared["cached_analysis"]
+        else:
+            pending.append(index)
+
+    if pending and GOOGLE_API_KEY:
+        entries = []
+        for index in pending:
+            app = applications[index]
+            resume = await _extract_pdf_text(_application_file_path(app), prepared_list[index]["content_hash"])
+            entries.append(
+                {
+                    "index": index,
+                    "title": app["title"],
+                    "description": condense_text(app["description"], DESCRIPTION_TOKEN_BUDGET),
+                    "resume": condense_resume(resume)[:BATCH_RESUME_CHARS],
+                }
+            )
+        prompt = json.dumps(entries)
+        async with llm_limiter.slot(estimate_tokens(GEMINI_BATCH_INSTRUCTIONS, prompt)):
+            rows = await _call_gemini_batch(prompt)
+
+        for row in rows:
+            index = row.get("index")
+            if index not in pending or results[index] is not None or not isinstance(row.get("qualifies"), bool):
+                continue
+            file_path = _application_file_path(applications[index])
+            result = {
+                "qualifies": row["qualifies"],
+                "reason": str(row.get("reason", "")),
+                "missing_keywords": row.get("missing_keywords") or [],
+                "used_gemini": True,
+                "batched": True,
+                "file_path": str(file_path) if file_path else "",
+            }
+            await cache_screening_result(prepared_list[index]["cache_key"], result)
+            results[index] = result
+
+    missing = [index for index, result in enumerate(results) if result is None]
+    if missing:
+        logger.info("Screening %s of %s batch entries individually", len(missing), len(applications))
+        singles = await asyncio.gather(
+            *(
+                analyze_application(
+                    email=applications[index]["email"],
+                    title=applications[index]["title"],
+                    description=applications[index]["description"],
+                    file_path=_application_file_path(applications[index]),
+                    content_hash=prepared_list[index]["content_hash"],
+                )
+                for index in missing
+            )
+        )
+        for index, result in zip(missing, singles):
+            results[index] = result
+    return results
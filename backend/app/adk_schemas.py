@@ -0,0 +1,25 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class CandidateProfileSchema(BaseModel):
+    name: Optional[str] = Field(default=None)
+    email: Optional[str] = Field(default=None)
+    phone: Optional[str] = Field(default=None)
+    location: Optional[str] = Field(default=None)
+    years_experience: Optional[float] = Field(default=None)
+    skills: List[str] = Field(default_factory=list)
+    employment_summary: str = Field(default="")
+    education_summary: str = Field(default="")
+    red_flags: List[str] = Field(default_factory=list)
+    raw_resume_excerpt: str = Field(default="")
+
+
+class EvaluationResultSchema(BaseModel):
+    score_0_to_100: int = Field(ge=0, le=100)
+    decision: str = Field(description="strong_reject | reject | borderline | interview | strong_hire")
+    strengths: List[str] = Field(default_factory=list)
+    concerns: List[str] = Field(default_factory=list)
+    interview_questions: List[str] = Field(default_factory=list)
+    suggested_next_step: str = Field(default="")
@@ -1,16 +1,31 @@
+import hashlib
 import json
 import re
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+from uuid import uuid4
 
-from google.adk.agents import LlmAgent
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types
-from pydantic import BaseModel, Field
+from .config import DESCRIPTION_TOKEN_BUDGET, GEMINI_MODEL
+from .llm_limiter import estimate_tokens, llm_limiter
+from .metrics import LLM_CALL_SECONDS, timed
+from .prescreen import missing_skills
+from .prompt_builder import condense_resume, condense_text
+from .resume_text import extract_resume_text_async
 
-from .config import GEMINI_MODEL
+if TYPE_CHECKING:
+    from google.adk.agents import LlmAgent
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
 
-KEYWORDS = ["react", "node"]
+# google.adk, google.genai and pydantic are imported on first use so that importing this
+# module (and everything that imports it) stays cheap; see app/import_check.py.
+
+APP_NAME = "application-screening"
+
+# Shared per worker process; sessions are deleted after each run so this stays small.
+_session_service: Optional["InMemorySessionService"] = None
+_runners: Dict[Tuple[str, str], "Runner"] = {}
 
 
 def _adk_model_name() -> str:
@@ -19,6 +34,25 @@ def _adk_model_name() -> str:
     return GEMINI_MODEL
 
 
+def _get_session_service() -> "InMemorySessionService":
+    global _session_service
+    if _session_service is None:
+        from google.adk.sessions import InMemorySessionService
+
+        _session_service = InMemorySessionService()
+    return _session_service
+
+
+def _get_runner(agent: Any, app_name: str) -> "Runner":
+    key = (agent.name, app_name)
+    runner = _runners.get(key)
+    if runner is None or runner.agent is not agent:
+        from google.adk.runners import Runner
+
+        runner = Runner(agent=agent, app_name=app_name, session_service=_get_session_service())
+        _runners[key] = runner
+    return runner
+
 
 async def run_agent_once(
     *,
@@ -28,18 +62,26 @@ async def run_agent_once(
     session_id: str,
     message_text: str,
 ) -> str:
-    session_service = InMemorySessionService()
+    session_service = _get_session_service()
     await session_service.create_session(app_name=app_name, user_id=user_id, session_id=session_id)
 
-    runner = Runner(agent=agent, app_name=app_name, session_service=session_service)
+    from google.genai import types
+
+    runner = _get_runner(agent, app_name)
     content = types.Content(role="user", parts=[types.Part(text=message_text)])
 
     final_text: Optional[str] = None
-    async for event in runner.run_async(user_id=user_id, session_id=session_id, new_message=content):
-        if event.is_final_response() and event.content and event.content.parts:
-            text_parts = [part.text for part in event.content.parts if getattr(part, "text", None)]
-            if text_parts:
-                final_text = "\n".join(text_parts).strip()
+    try:
+        async with llm_limiter.slot(estimate_tokens(getattr(agent, "instruction", ""), message_text)):
+            with timed(LLM_CALL_SECONDS, stage=agent.name, outcome="error") as labels:
+                async for event in runner.run_async(user_id=user_id, session_id=session_id, new_message=content):
+                    if event.is_final_response() and event.content and event.content.parts:
+                        text_parts = [part.text for part in event.content.parts if getattr(part, "text", None)]
+                        if text_parts:
+                            final_text = "\n".join(text_parts).strip()
+                labels["outcome"] = "ok"
+    finally:
+        await session_service.delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
 
     if final_text is None:
         raise RuntimeError("ADK agent produced no final response text")
@@ -74,53 +116,12 @@ def must_json(text: str) -> dict:
         raise ValueError(f"Agent did not return valid JSON. Raw output:\n{text}\n\nError: {exc}")
 
 
+@lru_cache(maxsize=1)
+def intake_instruction() -> str:
+    from .adk_schemas import CandidateProfileSchema
 
-
-def tool_extract_resume_text(pdf_path: str) -> Dict[str, Any]:
-   
-    try:
-        from pypdf import PdfReader
-
-        reader = PdfReader(pdf_path)
-        pages = [page.extract_text() or "" for page in reader.pages]
-        return {"status": "success", "text": "\n".join(pages)}
-    except Exception as exc:
-        return {"status": "error", "message": str(exc)}
-
-
-
-
-class CandidateProfileSchema(BaseModel):
-    name: Optional[str] = Field(default=None)
-    email: Optional[str] = Field(default=None)
-    phone: Optional[str] = Field(default=None)
-    location: Optional[str] = Field(default=None)
-    years_experience: Optional[float] = Field(default=None)
-    skills: List[str] = Field(default_factory=list)
-    employment_summary: str = Field(default="")
-    education_summary: str = Field(default="")
-    red_flags: List[str] = Field(default_factory=list)
-    raw_resume_excerpt: str = Field(default="")
-
-
-class EvaluationResultSchema(BaseModel):
-    score_0_to_100: int = Field(ge=0, le=100)
-    decision: str = Field(description="strong_reject | reject | borderline | interview | strong_hire")
-    strengths: List[str] = Field(default_factory=list)
-    concerns: List[str] = Field(default_factory=list)
-    interview_questions: List[str] = Field(default_factory=list)
-    suggested_next_step: str = Field(default="")
-
-
-
-
-def build_intake_agent() -> LlmAgent:
-    return LlmAgent(
-        name="intake_agent",
-        model=_adk_model_name(),
-        description="Parses applicant form, resume and extracts structured candidate profile.",
-        # Generated instructions
-        instruction=f"""
+    # Generated instructions
+    return f"""
 You are IntakeAgent for hiring.
 
 You will receive JSON with fields:
@@ -128,31 +129,26 @@ You will receive JSON with fields:
 - email
 - title
 - description
-- resume_path
+- resume_text (already extracted and condensed; may be empty)
 
 MUST DO:
-1) Call the tool `tool_extract_resume_text` with the resume_path to get resume text.
-2) Extract a candidate profile for a Full Stack Developer application.
-3) Return ONLY valid JSON matching this schema:
+1) Extract a candidate profile for a Full Stack Developer application from these fields.
+2) Return ONLY valid JSON matching this schema:
 {json.dumps(CandidateProfileSchema.model_json_schema(), indent=2)}
 
 Rules:
 - If a field is unknown, use null (not empty string) for optional fields.
 - skills should be normalized (e.g., "Node.js" not "node").
 - Include up to ~1200 chars in raw_resume_excerpt (a helpful excerpt).
-""".strip(),
-        tools=[tool_extract_resume_text],
-        output_key="candidate_profile_json",
-    )
+""".strip()
 
 
-def build_evaluator_agent() -> LlmAgent:
-    return LlmAgent(
-        name="evaluator_agent",
-        model=_adk_model_name(),
-        description="Evaluates candidate fit for the role and produces a hiring recommendation.",
-        # Generated instructions
-        instruction=f"""
+@lru_cache(maxsize=1)
+def evaluator_instruction() -> str:
+    from .adk_schemas import EvaluationResultSchema
+
+    # Generated instructions
+    return f"""
 You are EvaluatorAgent for hiring.
 
 You will receive JSON with:
@@ -169,59 +165,110 @@ Evaluate for a Full Stack Developer role and produce:
 
 Return ONLY valid JSON matching this schema:
 {json.dumps(EvaluationResultSchema.model_json_schema(), indent=2)}
-""".strip(),
+""".strip()
+
+
+def prompt_fingerprint() -> str:
+    # Changes whenever prompts, schemas or the model change; used to version cached results.
+    material = "\n".join([_adk_model_name(), intake_instruction(), evaluator_instruction()])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def build_intake_agent() -> "LlmAgent":
+    from google.adk.agents import LlmAgent
+
+    return LlmAgent(
+        name="intake_agent",
+        model=_adk_model_name(),
+        description="Parses applicant form, resume and extracts structured candidate profile.",
+        instruction=intake_instruction(),
+        output_key="candidate_profile_json",
+    )
+
+
+@lru_cache(maxsize=1)
+def get_intake_agent() -> "LlmAgent":
+    return build_intake_agent()
+
+
+def build_evaluator_agent() -> "LlmAgent":
+    from google.adk.agents import LlmAgent
+
+    from .adk_schemas import EvaluationResultSchema
+
+    return LlmAgent(
+        name="evaluator_agent",
+        model=_adk_model_name(),
+        description="Evaluates candidate fit for the role and produces a hiring recommendation.",
+        instruction=evaluator_instruction(),
         output_schema=EvaluationResultSchema,
         output_key="evaluation_result_json",
     )
 
 
-async def run_adk_pipeline(
+@lru_cache(maxsize=1)
+def get_evaluator_agent() -> "LlmAgent":
+    return build_evaluator_agent()
+
+
+async def run_adk_intake(
     *,
     application_id: str,
     email: str,
     title: str,
     description: str,
     resume_path: Optional[str],
+    resume_sha256: Optional[str] = None,
 ) -> Dict[str, Any]:
-    intake_agent = build_intake_agent()
-    evaluator_agent = build_evaluator_agent()
-
+    # Same applicant can be screened concurrently; keep session ids unique in the shared service.
+    run_id = uuid4().hex[:12]
+    # The resume goes inline (from the text cache) rather than via a tool call, saving a model turn.
+    resume_text = await extract_resume_text_async(Path(resume_path) if resume_path else None, resume_sha256)
     intake_prompt = json.dumps(
         {
             "application_id": application_id,
             "email": email,
             "title": title,
-            "description": description,
-            "resume_path": resume_path or "",
+            "description": condense_text(description, DESCRIPTION_TOKEN_BUDGET),
+            "resume_text": condense_resume(resume_text),
         }
     )
     intake_text = await run_agent_once(
-        agent=intake_agent,
-        app_name="application-screening",
+        agent=get_intake_agent(),
+        app_name=APP_NAME,
         user_id=email,
-        session_id=f"{application_id}-intake",
+        session_id=f"{application_id}-{run_id}-intake",
         message_text=intake_prompt,
     )
-    candidate_profile = must_json(intake_text)
+    return must_json(intake_text)
 
+
+async def run_adk_evaluation(
+    *,
+    application_id: str,
+    email: str,
+    title: str,
+    description: str,
+    candidate_profile: Dict[str, Any],
+) -> Dict[str, Any]:
+    run_id = uuid4().hex[:12]
     evaluator_prompt = json.dumps(
         {
             "title": title,
-            "description": description,
+            "description": condense_text(description, DESCRIPTION_TOKEN_BUDGET),
             "candidate_profile": candidate_profile,
         }
     )
     eval_text = await run_agent_once(
-        agent=evaluator_agent,
-        app_name="application-screening",
+        agent=get_evaluator_agent(),
+        app_name=APP_NAME,
         user_id=email,
-        session_id=f"{application_id}-eval",
+        session_id=f"{application_id}-{run_id}-eval",
         message_text=evaluator_prompt,
     )
     evaluation = must_json(eval_text)
 
-    lowered = (description + " " + json.dumps(candidate_profile)).lower()
-    missing_keywords = [kw for kw in KEYWORDS if kw not in lowered]
+    missing_keywords = missing_skills(description + " " + json.dumps(candidate_profile))
     decision = evaluation.get("decision", "").lower()
     qualifies = decision in {"interview", "strong_hire"}
 
@@ -233,3 +280,29 @@ async def run_adk_pipeline(
         "candidate_profile": candidate_profile,
         "evaluation": evaluation,
     }
+
+
+async def run_adk_pipeline(
+    *,
+    application_id: str,
+    email: str,
+    title: str,
+    description: str,
+    resume_path: Optional[str],
+    resume_sha256: Optional[str] = None,
+) -> Dict[str, Any]:
+    candidate_profile = await run_adk_intake(
+        application_id=application_id,
+        email=email,
+        title=title,
+        description=description,
+        resume_path=resume_path,
+        resume_sha256=resume_sha256,
+    )
+    return await run_adk_evaluation(
+        application_id=application_id,
+        email=email,
+        title=title,
+        description=description,
+        candidate_profile=candidate_profile,
+    )
@@ -0,0 +1,455 @@
+"""Offline throughput benchmark for ApplicationWorkflow and NotifyFailedWorkflow.
+
+Runs the real workflows and activities against Temporal's time-skipping test server, with
+a fake LLM in place of ADK/Gemini, a local SMTP sink and a generated PDF corpus, so no
+credentials or network services are needed:
+
+    python -m app.benchmark --scales 10,100,500 --llm-latency 0.4 --llm-error-rate 0.02
+
+Timers and retry backoff are skipped by the test server; activity work (PDF parsing, the
+fake LLM's latency, SQLite writes, SMTP round trips) runs in real time.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import resource
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# app.config reads the environment at import time, so app modules are imported inside
+# main() once _configure_environment() has pointed every store at a scratch directory.
+
+SKILL_POOL = ["React", "Node.js", "TypeScript", "PostgreSQL", "GraphQL", "Docker", "AWS", "Python", "Go", "Kubernetes"]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# --- PDF corpus --------------------------------------------------------------------------
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages: List[List[str]]) -> bytes:
+    """Minimal PDF with one Helvetica text stream per page; enough for pypdf's extract_text."""
+    objects: List[bytes] = []
+    page_ids = [3 + index * 2 for index in range(len(pages))]
+    font_id = 3 + len(pages) * 2
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    for page_id, lines in zip(page_ids, pages):
+        shown = " ".join(f"({_pdf_escape(line)}) '" for line in lines)
+        stream = f"BT /F1 11 Tf 50 760 Td 14 TL {shown} ET".encode("latin-1", "replace")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {page_id + 1} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_at = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_at)
+    return bytes(out)
+
+
+def build_corpus(directory: Path, count: int, pages: int, rng: random.Random) -> List[Dict[str, Any]]:
+    directory.mkdir(parents=True, exist_ok=True)
+    applications = []
+    for index in range(count):
+        candidate = uuid.uuid4().hex[:10]
+        skills = rng.sample(SKILL_POOL, k=rng.randint(2, 6))
+        years = rng.randint(1, 12)
+        body = [
+            f"Candidate {candidate}",
+            f"{'Senior' if years >= 5 else 'Junior'} software engineer, {years} years of experience.",
+            f"Skills: {', '.join(skills)}.",
+        ]
+        body += [f"Project {n}: built services with {rng.choice(skills)} for team {candidate}." for n in range(30)]
+        path = directory / f"resume-{index:06d}.pdf"
+        path.write_bytes(make_pdf([body] * pages))
+        applications.append(
+            {
+                "email": f"{candidate}@bench.invalid",
+                "title": f"Application {index}",
+                "description": f"I have {years} years with {', '.join(skills)}.",
+                "file_path": str(path),
+                "source": "benchmark",
+            }
+        )
+    return applications
+
+
+# --- Fake LLM ----------------------------------------------------------------------------
+
+
+class FakeLlm:
+    """Stands in for the ADK agents and Gemini with seeded latency, errors and verdicts."""
+
+    def __init__(self, latency: float, jitter: float, error_rate: float, qualify_rate: float, seed: int) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.qualify_rate = qualify_rate
+        self._rng = random.Random(seed)
+        self.calls: Dict[str, int] = {}
+        self.errors = 0
+
+    async def _call(self, stage: str) -> None:
+        self.calls[stage] = self.calls.get(stage, 0) + 1
+        delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+        await asyncio.sleep(delay)
+        if self._rng.random() < self.error_rate:
+            self.errors += 1
+            raise RuntimeError(f"fake {stage} failure")
+
+    def _verdict(self) -> bool:
+        return self._rng.random() < self.qualify_rate
+
+    async def run_adk_intake(self, *, application_id: str, email: str, title: str, description: str,
+                             resume_path: Optional[str], resume_sha256: Optional[str] = None) -> Dict[str, Any]:
+        await self._call("intake")
+        return {
+            "name": email.split("@")[0],
+            "email": email,
+            "seniority": "senior",
+            "years_experience": self._rng.randint(1, 12),
+            "skills": self._rng.sample(SKILL_POOL, k=4),
+        }
+
+    async def run_adk_evaluation(self, *, application_id: str, email: str, title: str, description: str,
+                                 candidate_profile: Dict[str, Any]) -> Dict[str, Any]:
+        await self._call("evaluator")
+        qualifies = self._verdict()
+        decision = "interview" if qualifies else "reject"
+        return {
+            "used_gemini": True,
+            "qualifies": qualifies,
+            "reason": decision,
+            "missing_keywords": [],
+            "candidate_profile": candidate_profile,
+            "evaluation": {"decision": decision, "score": self._rng.randint(0, 100)},
+        }
+
+    async def run_adk_pipeline(self, **kwargs: Any) -> Dict[str, Any]:
+        profile = await self.run_adk_intake(**kwargs)
+        kwargs.pop("resume_path", None)
+        kwargs.pop("resume_sha256", None)
+        return await self.run_adk_evaluation(candidate_profile=profile, **kwargs)
+
+    async def call_gemini(self, prompt: str) -> Optional[Dict]:
+        try:
+            await self._call("gemini")
+        except RuntimeError:
+            return None
+        qualifies = self._verdict()
+        return {"qualifies": qualifies, "reason": "fake gemini", "missing_keywords": [], "used_gemini": True}
+
+    async def call_gemini_batch(self, prompt: str) -> List[Dict]:
+        try:
+            await self._call("gemini_batch")
+        except RuntimeError:
+            return []
+        return [
+            {"index": entry["index"], "qualifies": self._verdict(), "reason": "fake gemini batch"}
+            for entry in json.loads(prompt)
+        ]
+
+
+def install_fakes(llm: FakeLlm) -> None:
+    from . import activities, adk_client
+
+    activities.run_adk_intake = llm.run_adk_intake
+    activities.run_adk_evaluation = llm.run_adk_evaluation
+    adk_client.run_adk_pipeline = llm.run_adk_pipeline
+    adk_client._call_gemini = llm.call_gemini
+    adk_client._call_gemini_batch = llm.call_gemini_batch
+
+
+# --- SMTP sink ---------------------------------------------------------------------------
+
+
+class SmtpSink:
+    """Plain-text SMTP server on its own thread and loop that accepts and counts every message."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.port = 0
+        self.received: List[float] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="smtp-sink", daemon=True)
+
+    def start(self) -> "SmtpSink":
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._server = self._loop.run_until_complete(asyncio.start_server(self._session, "127.0.0.1", 0))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+        self._server.close()
+
+    async def _session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        async def reply(line: str) -> None:
+            writer.write(line.encode() + b"\r\n")
+            await writer.drain()
+
+        await reply("220 sink ESMTP")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                verb = line.decode(errors="replace").strip().split(" ", 1)[0].upper()
+                if verb in {"EHLO", "HELO"}:
+                    await reply("250-sink\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME")
+                elif verb == "AUTH":
+                    await reply("235 2.7.0 Authentication successful")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    while (await reader.readline()).rstrip(b"\r\n") != b".":
+                        pass
+                    if self.latency:
+                        await asyncio.sleep(self.latency)
+                    self.received.append(time.perf_counter())
+                    await reply("250 2.0.0 Queued")
+                elif verb == "QUIT":
+                    await reply("221 2.0.0 Bye")
+                    break
+                else:
+                    await reply("250 2.0.0 OK")
+        finally:
+            writer.close()
+
+
+# --- Scenarios ---------------------------------------------------------------------------
+
+
+def _configure_environment(scratch: Path, sink_port: int) -> None:
+    run_id = uuid.uuid4().hex[:8]
+    os.environ.update(
+        {
+            "GOOGLE_API_KEY": "benchmark-fake-key",
+            "STORAGE_BACKEND": "sqlite",
+            "STORAGE_DB_PATH": str(scratch / "applications.db"),
+            "SCREENING_CACHE_PATH": str(scratch / "screening_cache.db"),
+            "SCREENING_CACHE_TTL_SECONDS": "0",
+            "RESUME_TEXT_CACHE_DIR": str(scratch / "resume_text_cache"),
+            "SMTP_HOST": "127.0.0.1",
+            "SMTP_PORT": str(sink_port),
+            "SMTP_USERNAME": "bench",
+            "SMTP_PASSWORD": "bench",
+            "SMTP_FROM": "bench@bench.invalid",
+            "SMTP_STARTTLS": "0",
+            "BLOB_STORE_DIR": str(scratch / "blobs"),
+            "TEMPORAL_TASK_QUEUE": f"benchmark-{run_id}",
+            "TEMPORAL_EXTRACT_TASK_QUEUE": f"benchmark-{run_id}-extract",
+        }
+    )
+    # The limiter is part of the pipeline, but by default it should not be what gets measured.
+    os.environ.setdefault("LLM_REQUESTS_PER_MINUTE", "1000000")
+    os.environ.setdefault("LLM_TOKENS_PER_MINUTE", "1000000000")
+    os.environ.setdefault("LLM_MAX_IN_FLIGHT", "1000")
+
+
+def _summary(name: str, count: int, wall: float, latencies: List[float], **extra: Any) -> Dict[str, Any]:
+    return {
+        "workflow": name,
+        "n": count,
+        "wall_s": round(wall, 3),
+        "per_s": round(count / wall, 2) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        **extra,
+    }
+
+
+async def bench_applications(client: Any, task_queue: str, applications: List[Dict], concurrency: int) -> Dict:
+    from .workflows import ApplicationWorkflow
+
+    slots = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    qualified = 0
+
+    async def one(application: Dict) -> None:
+        nonlocal qualified
+        async with slots:
+            started = time.perf_counter()
+            handle = await client.start_workflow(
+                ApplicationWorkflow.run,
+                application,
+                id=f"bench-app-{uuid.uuid4().hex}",
+                task_queue=task_queue,
+            )
+        result = await handle.result()
+        latencies.append(time.perf_counter() - started)
+        qualified += int(bool(result["analysis"].get("qualifies")))
+
+    began = time.perf_counter()
+    await asyncio.gather(*(one(application) for application in applications))
+    return _summary("ApplicationWorkflow", len(applications), time.perf_counter() - began, latencies,
+                    qualified=qualified)
+
+
+async def bench_notifications(client: Any, task_queue: str, count: int, sink: SmtpSink, options: Dict) -> Dict:
+    from .notification_workflow import NotifyFailedWorkflow
+    from .storage import (append_failed_record, get_unnotified_failed,
+                          mark_failed_notified)
+
+    # Rejections left over from earlier scenarios would otherwise be counted here too.
+    leftovers = [row["id"] for row in get_unnotified_failed()]
+    if leftovers:
+        mark_failed_notified(leftovers)
+    for index in range(count):
+        append_failed_record(
+            {
+                "id": f"bench-failed-{uuid.uuid4().hex}",
+                "email": f"rejected-{index}@bench.invalid",
+                "title": "Application",
+                "description": "",
+                "file_path": "",
+                "evaluated_at": "2026-01-01T00:00:00Z",
+                "analysis": {"qualifies": False, "reason": "benchmark"},
+                "notified_at": None,
+            }
+        )
+
+    first_message = len(sink.received)
+    began = time.perf_counter()
+    totals = await client.execute_workflow(
+        NotifyFailedWorkflow.run,
+        options,
+        id=f"bench-notify-{uuid.uuid4().hex}",
+        task_queue=task_queue,
+    )
+    wall = time.perf_counter() - began
+    latencies = [received - began for received in sink.received[first_message:]]
+    return _summary("NotifyFailedWorkflow", count, wall, latencies, notified=totals.get("notified", 0),
+                    failed=totals.get("failed", 0))
+
+
+def _print_table(rows: List[Dict[str, Any]]) -> None:
+    columns = ["workflow", "n", "wall_s", "per_s", "p50_ms", "p99_ms", "peak_rss_mb"]
+    print("  ".join(f"{column:>20}" if column == "workflow" else f"{column:>11}" for column in columns))
+    for row in rows:
+        print("  ".join(f"{row[column]:>20}" if column == "workflow" else f"{row[column]:>11}" for column in columns))
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    scratch = Path(tempfile.mkdtemp(prefix="screening-bench-"))
+    sink = SmtpSink(latency=args.smtp_latency).start()
+    _configure_environment(scratch, sink.port)
+
+    from temporalio.client import Client
+    from temporalio.testing import WorkflowEnvironment
+
+    from .config import TEMPORAL_TASK_QUEUE
+    from .payload_codec import data_converter
+    from .resume_text import stop_parsers
+    from .worker import build_workers
+
+    llm = FakeLlm(args.llm_latency, args.llm_jitter, args.llm_error_rate, args.qualify_rate, args.seed)
+    install_fakes(llm)
+    rng = random.Random(args.seed)
+    scales = [int(scale) for scale in args.scales.split(",") if scale.strip()]
+    workflows = set(args.workflows.split(","))
+    task_queue = TEMPORAL_TASK_QUEUE
+    notify_options = {"batch_size": args.notify_batch_size, "max_parallel": args.notify_max_parallel}
+
+    if args.target:
+        env = None
+        client = await Client.connect(args.target, data_converter=data_converter())
+    else:
+        env = await WorkflowEnvironment.start_time_skipping(data_converter=data_converter())
+        client = env.client
+
+    rows: List[Dict[str, Any]] = []
+    try:
+        async with AsyncExitStack() as workers:
+            for worker in build_workers(client):
+                await workers.enter_async_context(worker)
+            for scale in scales:
+                if "application" in workflows:
+                    corpus = await asyncio.to_thread(
+                        build_corpus, scratch / f"corpus-{scale}", scale, args.pages, rng
+                    )
+                    rows.append(await bench_applications(client, task_queue, corpus, args.start_concurrency))
+                if "notify" in workflows:
+                    rows.append(await bench_notifications(client, task_queue, scale, sink, notify_options))
+                print(json.dumps(rows[-1]))
+    finally:
+        stop_parsers()
+        if env is not None:
+            await env.shutdown()
+        sink.stop()
+
+    print(f"fake LLM calls: {llm.calls}, injected errors: {llm.errors}, emails received: {len(sink.received)}")
+    print(f"scratch data left in {scratch}")
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="10,100,500", help="comma-separated application counts")
+    parser.add_argument("--workflows", default="application,notify", help="application and/or notify")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="mean fake LLM latency per call (s)")
+    parser.add_argument("--llm-jitter", type=float, default=0.2, help="uniform +/- jitter on that latency (s)")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="fraction of fake LLM calls that fail")
+    parser.add_argument("--qualify-rate", type=float, default=0.3, help="fraction of applicants that pass")
+    parser.add_argument("--smtp-latency", type=float, default=0.0, help="sink delay per accepted message (s)")
+    parser.add_argument("--pages", type=int, default=2, help="pages per generated resume PDF")
+    parser.add_argument("--start-concurrency", type=int, default=50, help="workflow starts in flight at once")
+    parser.add_argument("--notify-batch-size", type=int, default=50)
+    parser.add_argument("--notify-max-parallel", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--target", default="", help="use an existing Temporal server instead of time-skipping")
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    args = parser.parse_args()
+
+    rows = asyncio.run(run(args))
+    _print_table(rows)
+    if args.json:
+        args.json.write_text(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+import asyncio
+import csv
+import io
+import json
+import logging
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, Optional, Set, Tuple
+from uuid import uuid4
+
+from .config import MAX_UPLOAD_BYTES, UPLOAD_DIR
+from .sqlite_store import SqliteStore, utcnow
+from .temporal_client import StartFn
+from .uploads import (PDF_MAGIC, UploadRejected, copy_stream,
+                      store_content_addressed)
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAMES = ("manifest.csv", "manifest.jsonl")
+MAX_TRACKED_ERRORS = 50
+PROGRESS_FLUSH_EVERY = 50
+INTERRUPTED_ERROR = "Ingestion was interrupted by an API restart; resubmit the archive to finish it."
+
+_BULK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bulk_batches (
+    batch_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    progress TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+def _new_progress() -> Dict:
+    return {"rows": 0, "queued": 0, "duplicates": 0, "rejected": 0, "errors": []}
+
+
+class BulkBatchTracker(SqliteStore):
+    """Persists ingestion progress per bulk batch so it can be polled across API restarts."""
+
+    schema = _BULK_SCHEMA
+
+    def create(self, batch_id: str) -> None:
+        now = utcnow()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO bulk_batches (batch_id, status, progress, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (batch_id, "ingesting", json.dumps(_new_progress()), now, now),
+                )
+
+    def update(self, batch_id: str, status: str, progress: Dict) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "UPDATE bulk_batches SET status = ?, progress = ?, updated_at = ? WHERE batch_id = ?",
+                    (status, json.dumps(progress), utcnow(), batch_id),
+                )
+
+    def fail_interrupted(self) -> int:
+        # Ingestion runs inside the API process, so a batch still "ingesting" at startup was cut
+        # off by a restart and will never finish. Assumes a single API process per database.
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                rows = conn.execute(
+                    "SELECT batch_id, progress FROM bulk_batches WHERE status = 'ingesting'"
+                ).fetchall()
+                now = utcnow()
+                for batch_id, progress in rows:
+                    progress = json.loads(progress)
+                    progress["errors"].append({"row": None, "error": INTERRUPTED_ERROR})
+                    conn.execute(
+                        "UPDATE bulk_batches SET status = 'failed', progress = ?, updated_at = ? "
+                        "WHERE batch_id = ?",
+                        (json.dumps(progress), now, batch_id),
+                    )
+        return len(rows)
+
+    def get(self, batch_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT status, progress, created_at, updated_at FROM bulk_batches WHERE batch_id = ?",
+                (batch_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        status, progress, created_at, updated_at = row
+        return {
+            "batch_id": batch_id,
+            "status": status,
+            "created_at": created_at,
+            "updated_at": updated_at,
+            **json.loads(progress),
+        }
+
+
+def remove_staged_uploads() -> int:
+    # Archives, manifests and members staged for batches that a restart interrupted.
+    removed = 0
+    for staged in UPLOAD_DIR.glob(".bulk-*"):
+        staged.unlink(missing_ok=True)
+        removed += 1
+    return removed
+
+
+def iter_manifest(handle: BinaryIO, name: str) -> Iterator[Dict]:
+    text = io.TextIOWrapper(handle, encoding="utf-8-sig", newline="")
+    if name.lower().endswith((".jsonl", ".ndjson")):
+        for line_no, line in enumerate(text, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                row = {"_error": f"line {line_no}: {exc}"}
+            yield row if isinstance(row, dict) else {"_error": f"line {line_no}: not an object"}
+    else:
+        yield from csv.DictReader(text)
+
+
+def _find_manifest(archive: zipfile.ZipFile) -> str:
+    for info in archive.infolist():
+        if Path(info.filename).name.lower() in MANIFEST_NAMES:
+            return info.filename
+    raise ValueError("No manifest uploaded and no manifest.csv/manifest.jsonl inside the archive.")
+
+
+def _extract_member(archive: zipfile.ZipFile, member: str) -> Tuple[Path, str]:
+    info = archive.getinfo(member)
+    if info.file_size > MAX_UPLOAD_BYTES:
+        raise UploadRejected(413, f"{member} exceeds the {MAX_UPLOAD_BYTES} byte upload limit.")
+    staged = UPLOAD_DIR / f".bulk-{uuid4().hex}.part"
+    try:
+        with archive.open(info) as source:
+            content_hash, _ = copy_stream(source, staged, MAX_UPLOAD_BYTES, magic=PDF_MAGIC)
+    except BaseException:
+        staged.unlink(missing_ok=True)
+        raise
+    return store_content_addressed(staged, content_hash), content_hash
+
+
+async def ingest_bulk_archive(
+    *,
+    batch_id: str,
+    archive_path: Path,
+    manifest_path: Optional[Path],
+    manifest_name: str,
+    tracker: BulkBatchTracker,
+    start: StartFn,
+    concurrency: int,
+) -> None:
+    """Stream manifest rows and archive members one at a time, starting one workflow per new resume."""
+    progress = _new_progress()
+    slots = asyncio.Semaphore(concurrency)
+    in_flight: Set[asyncio.Task] = set()
+    seen: Set[Tuple[str, str]] = set()
+    status = "ingested"
+
+    def reject(row_no: int, reason: str) -> None:
+        progress["rejected"] += 1
+        if len(progress["errors"]) < MAX_TRACKED_ERRORS:
+            progress["errors"].append({"row": row_no, "error": reason})
+
+    async def queue(workflow_id: str, payload: Dict) -> None:
+        try:
+            await start(workflow_id, payload)
+        finally:
+            slots.release()
+
+    try:
+        archive = await asyncio.to_thread(zipfile.ZipFile, archive_path)
+        with archive:
+            if manifest_path is not None:
+                manifest_handle: BinaryIO = open(manifest_path, "rb")
+            else:
+                manifest_name = _find_manifest(archive)
+                manifest_handle = archive.open(manifest_name)
+            with manifest_handle:
+                rows = iter_manifest(manifest_handle, manifest_name)
+                while True:
+                    row = await asyncio.to_thread(next, rows, None)
+                    if row is None:
+                        break
+                    progress["rows"] += 1
+                    row_no = progress["rows"]
+
+                    email = (row.get("email") or "").strip()
+                    member = (row.get("file") or row.get("file_name") or row.get("resume") or "").strip()
+                    if row.get("_error") or not email or not member:
+                        reject(row_no, row.get("_error") or "Row needs 'email' and 'file' columns.")
+                        continue
+                    try:
+                        stored_path, content_hash = await asyncio.to_thread(_extract_member, archive, member)
+                    except KeyError:
+                        reject(row_no, f"{member} not found in archive.")
+                        continue
+                    except UploadRejected as exc:
+                        reject(row_no, f"{member}: {exc.detail}")
+                        continue
+
+                    dedupe_key = (email.lower(), content_hash)
+                    if dedupe_key in seen:
+                        progress["duplicates"] += 1
+                        continue
+                    seen.add(dedupe_key)
+
+                    payload = {
+                        "email": email,
+                        "title": (row.get("title") or "(no title)").strip(),
+                        "description": (row.get("description") or "").strip(),
+                        "file_path": str(stored_path),
+                        "resume_sha256": content_hash,
+                        "source": "bulk",
+                    }
+                    await slots.acquire()
+                    task = asyncio.create_task(queue(f"{batch_id}-{row_no}", payload))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+                    progress["queued"] += 1
+
+                    if row_no % PROGRESS_FLUSH_EVERY == 0:
+                        await asyncio.to_thread(tracker.update, batch_id, "ingesting", progress)
+            if in_flight:
+                await asyncio.gather(*in_flight)
+    except Exception as exc:  # noqa: BLE001 - surfaced through the progress endpoint
+        logger.error("Bulk batch %s failed: %s", batch_id, exc)
+        status = "failed"
+        progress["errors"].append({"row": None, "error": str(exc)})
+    finally:
+        archive_path.unlink(missing_ok=True)
+        if manifest_path is not None:
+            manifest_path.unlink(missing_ok=True)
+        await asyncio.to_thread(tracker.update, batch_id, status, progress)
@@ -6,13 +6,91 @@ UPLOAD_DIR = ROOT_DIR / "uploads"
 DATA_DIR = ROOT_DIR / "data"
 TEMP_JSON_PATH = DATA_DIR / "accepted_applications.json"
 FAILED_JSON_PATH = DATA_DIR / "failed_applications.json"
+RESUME_TEXT_CACHE_DIR = Path(os.getenv("RESUME_TEXT_CACHE_DIR", str(ROOT_DIR / "resume_text_cache")))
+RESUME_TEXT_CACHE_SIZE = int(os.getenv("RESUME_TEXT_CACHE_SIZE", "256"))
+
+# PDF extraction (one process per parse, at most PDF_EXTRACT_WORKERS at a time)
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(os.cpu_count() or 2)))
+PDF_EXTRACT_TIMEOUT_SECONDS = float(os.getenv("PDF_EXTRACT_TIMEOUT_SECONDS", "30"))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "30"))
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", str(10 * 1024 * 1024)))
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(PDF_MAX_BYTES)))
+# Extraction activities in flight per worker; more than PDF_EXTRACT_WORKERS just queues in-process
+EXTRACT_MAX_CONCURRENT_ACTIVITIES = int(os.getenv("EXTRACT_MAX_CONCURRENT_ACTIVITIES", str(PDF_EXTRACT_WORKERS * 2)))
+
+# Storage: "sqlite" (append-only, indexed) or "json" (legacy whole-file rewrite)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "sqlite")
+STORAGE_DB_PATH = Path(os.getenv("STORAGE_DB_PATH", str(DATA_DIR / "applications.db")))
 
 # Temporal
 TEMPORAL_TARGET = os.getenv("TEMPORAL_TARGET", "localhost:7233")
 TEMPORAL_TASK_QUEUE = os.getenv("TEMPORAL_TASK_QUEUE", "application-review")
+# PDF extraction (CPU-bound) is routed to its own queue so it never starves LLM/email activities
+TEMPORAL_EXTRACT_TASK_QUEUE = os.getenv("TEMPORAL_EXTRACT_TASK_QUEUE", f"{TEMPORAL_TASK_QUEUE}-extract")
+
+# Temporal payload codec (app/payload_codec.py): zlib above COMPRESS_MIN, and above CLAIM_CHECK_MIN
+# the payload is written to BLOB_STORE_DIR and only its hash goes into history; 0 disables either.
+# Every process talking to Temporal must share BLOB_STORE_DIR while claim-check is on.
+PAYLOAD_COMPRESS_MIN_BYTES = int(os.getenv("PAYLOAD_COMPRESS_MIN_BYTES", "2048"))
+PAYLOAD_CLAIM_CHECK_MIN_BYTES = int(os.getenv("PAYLOAD_CLAIM_CHECK_MIN_BYTES", str(64 * 1024)))
+BLOB_STORE_DIR = Path(os.getenv("BLOB_STORE_DIR", str(DATA_DIR / "blobs")))
+
+# Worker tuning, per process (defaults match the SDK's); see `python -m app.worker --help`
+WORKER_PROCESSES = int(os.getenv("WORKER_PROCESSES", "1"))
+WORKER_ROLE = os.getenv("WORKER_ROLE", "all")  # all | io | extract
+WORKER_INDEX = int(os.getenv("WORKER_INDEX", "0"))  # set by the launcher for each child process
+WORKER_MAX_CONCURRENT_ACTIVITIES = int(os.getenv("WORKER_MAX_CONCURRENT_ACTIVITIES", "100"))
+WORKER_MAX_CONCURRENT_WORKFLOW_TASKS = int(os.getenv("WORKER_MAX_CONCURRENT_WORKFLOW_TASKS", "100"))
+WORKER_WORKFLOW_TASK_POLLERS = int(os.getenv("WORKER_WORKFLOW_TASK_POLLERS", "5"))
+WORKER_ACTIVITY_TASK_POLLERS = int(os.getenv("WORKER_ACTIVITY_TASK_POLLERS", "5"))
+# Thread pool behind asyncio.to_thread (SQLite, SMTP, hashing, cache files)
+WORKER_ACTIVITY_THREADS = int(os.getenv("WORKER_ACTIVITY_THREADS", "32"))
+
+# Outbox buffering workflow starts while Temporal is unreachable
+OUTBOX_DB_PATH = Path(os.getenv("OUTBOX_DB_PATH", str(DATA_DIR / "outbox.db")))
+OUTBOX_DRAIN_PER_SECOND = float(os.getenv("OUTBOX_DRAIN_PER_SECOND", "10"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "5"))
+# Only rejected starts count; polls while Temporal is down never mark an entry dead
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "20"))
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "models/gemini-2.5-flash")
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "60"))
+# Only used when the installed SDK has no native async call
+GEMINI_EXECUTOR_THREADS = int(os.getenv("GEMINI_EXECUTOR_THREADS", "8"))
+
+# Prompt construction: text sent to a model is condensed and capped to these token budgets
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", "1500"))
+DESCRIPTION_TOKEN_BUDGET = int(os.getenv("DESCRIPTION_TOKEN_BUDGET", "500"))
+
+# Batch screening: applications packed into one model request
+SCREENING_BATCH_SIZE = int(os.getenv("SCREENING_BATCH_SIZE", "10"))
+BATCH_RESUME_CHARS = int(os.getenv("BATCH_RESUME_CHARS", "4000"))
+BATCH_MAX_APPLICATIONS = int(os.getenv("BATCH_MAX_APPLICATIONS", "500"))
+
+# Bulk ZIP + manifest ingestion
+BULK_DB_PATH = Path(os.getenv("BULK_DB_PATH", str(DATA_DIR / "bulk_batches.db")))
+BULK_START_CONCURRENCY = int(os.getenv("BULK_START_CONCURRENCY", "8"))
+BULK_MAX_ARCHIVE_BYTES = int(os.getenv("BULK_MAX_ARCHIVE_BYTES", str(1024 * 1024 * 1024)))
+BULK_MAX_MANIFEST_BYTES = int(os.getenv("BULK_MAX_MANIFEST_BYTES", str(20 * 1024 * 1024)))
+
+# LLM call governor (per worker process; divide provider quotas across processes)
+LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "8"))
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "60"))
+LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "250000"))
+LLM_BACKOFF_INITIAL_SECONDS = float(os.getenv("LLM_BACKOFF_INITIAL_SECONDS", "2"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "60"))
+
+# Deterministic pre-screen ahead of any model call (scores are 0..1, see app/prescreen.py).
+# Below REJECT_BELOW is a final rejection; at or above ACCEPT_AT (0 disables) a final pass.
+PRESCREEN_ENABLED = os.getenv("PRESCREEN_ENABLED", "1").lower() not in {"0", "false", "no"}
+PRESCREEN_REJECT_BELOW = float(os.getenv("PRESCREEN_REJECT_BELOW", "0.35"))
+PRESCREEN_ACCEPT_AT = float(os.getenv("PRESCREEN_ACCEPT_AT", "0"))
+PRESCREEN_SENIOR_YEARS = int(os.getenv("PRESCREEN_SENIOR_YEARS", "3"))
+
+# Screening result cache; set the TTL to 0 to disable
+SCREENING_CACHE_PATH = Path(os.getenv("SCREENING_CACHE_PATH", str(DATA_DIR / "screening_cache.db")))
+SCREENING_CACHE_TTL_SECONDS = float(os.getenv("SCREENING_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
 
 # Email
 SMTP_HOST = os.getenv("SMTP_HOST", "")
@@ -20,6 +98,15 @@ SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
 SMTP_USERNAME = os.getenv("SMTP_USERNAME", "")
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "")
 SMTP_FROM = os.getenv("SMTP_FROM", SMTP_USERNAME or "")
+# Plain-text local relays and sinks (see app/benchmark.py) do not speak STARTTLS
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "1").lower() not in {"0", "false", "no"}
+NOTIFY_BATCH_SIZE = int(os.getenv("NOTIFY_BATCH_SIZE", "50"))
+NOTIFY_MAX_PARALLEL = int(os.getenv("NOTIFY_MAX_PARALLEL", "4"))
+
+# Prometheus metrics (the API also serves them at /metrics); a port of 0 or an empty bind disables
+WORKER_METRICS_PORT = int(os.getenv("WORKER_METRICS_PORT", "9464"))
+TEMPORAL_METRICS_BIND = os.getenv("TEMPORAL_METRICS_BIND", "0.0.0.0:9465")
 
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 DATA_DIR.mkdir(parents=True, exist_ok=True)
+RESUME_TEXT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
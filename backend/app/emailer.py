@@ -1,38 +1,125 @@
 import logging
 import smtplib
 from email.message import EmailMessage
-from typing import Optional
+from typing import Callable, Dict, List, Optional
 
 from .config import (SMTP_FROM, SMTP_HOST, SMTP_PASSWORD, SMTP_PORT,
-                     SMTP_USERNAME)
+                     SMTP_STARTTLS, SMTP_USERNAME)
+from .metrics import EMAILS, SMTP_SEND_SECONDS, timed
 
 logger = logging.getLogger(__name__)
 
+# Errors about one message; the session itself is still usable afterwards.
+_PER_MESSAGE_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+
 
 def _smtp_configured() -> bool:
     return all([SMTP_HOST, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD, SMTP_FROM])
 
 
-def send_notification_email(to_email: str, subject: str, body: str) -> Optional[str]:
-    
-    if not _smtp_configured():
-        logger.info("SMTP not configured; skipping email to %s", to_email)
-        return "smtp_not_configured"
-
+def _build_message(to_email: str, subject: str, body: str) -> EmailMessage:
     msg = EmailMessage()
     msg["From"] = SMTP_FROM
     msg["To"] = to_email
     msg["Subject"] = subject
     msg.set_content(body)
+    return msg
 
+
+def _open_smtp() -> smtplib.SMTP:
+    server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=15)
     try:
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=15) as server:
+        if SMTP_STARTTLS:
             server.starttls()
-            server.login(SMTP_USERNAME, SMTP_PASSWORD)
+        server.login(SMTP_USERNAME, SMTP_PASSWORD)
+    except Exception:
+        _close_smtp(server)
+        raise
+    return server
+
+
+def _close_smtp(server: Optional[smtplib.SMTP]) -> None:
+    if server is None:
+        return
+    try:
+        server.quit()
+    except Exception:  # noqa: BLE001 - connection may already be gone
+        server.close()
+
+
+def send_notification_email(to_email: str, subject: str, body: str) -> Optional[str]:
+
+    if not _smtp_configured():
+        logger.info("SMTP not configured; skipping email to %s", to_email)
+        EMAILS.labels(outcome="skipped").inc()
+        return "smtp_not_configured"
+
+    msg = _build_message(to_email, subject, body)
+
+    server: Optional[smtplib.SMTP] = None
+    try:
+        with timed(SMTP_SEND_SECONDS, mode="single"):
+            server = _open_smtp()
             server.send_message(msg)
         logger.info("Sent notification email to %s", to_email)
+        EMAILS.labels(outcome="sent").inc()
         return None
     except Exception as exc:  # noqa: BLE001 - best effort logging
         logger.error("Failed to send email to %s: %s", to_email, exc)
+        EMAILS.labels(outcome="failed").inc()
         return str(exc)
+    finally:
+        _close_smtp(server)
+
 
+def send_notification_emails(
+    messages: List[Dict[str, str]],
+    on_result: Optional[Callable[[int, Optional[str]], None]] = None,
+) -> List[Optional[str]]:
+    # Sends every message over one authenticated session, reconnecting once if it drops.
+    # Returns one error (or None) per message, in order; on_result(index, error) is called
+    # as each attempted message finishes, so callers can checkpoint progress. Messages never
+    # attempted (SMTP unconfigured or unreachable) only show up in the returned list.
+    if not _smtp_configured():
+        logger.info("SMTP not configured; skipping %s emails", len(messages))
+        EMAILS.labels(outcome="skipped").inc(len(messages))
+        return ["smtp_not_configured"] * len(messages)
+
+    results: List[Optional[str]] = []
+    server: Optional[smtplib.SMTP] = None
+    try:
+        for index, message in enumerate(messages):
+            msg = _build_message(message["email"], message["subject"], message["body"])
+            error: Optional[str] = None
+            for _ in range(2):
+                if server is None:
+                    try:
+                        with timed(SMTP_SEND_SECONDS, mode="connect"):
+                            server = _open_smtp()
+                    except Exception as exc:  # noqa: BLE001
+                        logger.error("Could not open SMTP session: %s", exc)
+                        remaining = len(messages) - index
+                        EMAILS.labels(outcome="failed").inc(remaining)
+                        return results + [str(exc)] * remaining
+                try:
+                    with timed(SMTP_SEND_SECONDS, mode="pooled"):
+                        server.send_message(msg)
+                    error = None
+                    break
+                except _PER_MESSAGE_ERRORS as exc:
+                    error = str(exc)
+                    break
+                except Exception as exc:  # noqa: BLE001 - reconnect and retry once
+                    error = str(exc)
+                    _close_smtp(server)
+                    server = None
+            if error:
+                logger.error("Failed to send email to %s: %s", message["email"], error)
+            EMAILS.labels(outcome="failed" if error else "sent").inc()
+            results.append(error)
+            if on_result:
+                on_result(index, error)
+    finally:
+        _close_smtp(server)
+    logger.info("Sent %s/%s notification emails", results.count(None), len(messages))
+    return results
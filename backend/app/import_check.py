@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Heavy stacks that must only load when a worker actually screens an application.
+HEAVY_MODULES = ("google.adk", "google.genai", "google.generativeai", "pypdf")
+TARGETS = ("app.main", "app.worker", "app.activities")
+
+
+def measure(target: str) -> List[Tuple[str, int, int]]:
+    """Import `target` in a fresh interpreter with -X importtime; returns (module, self_us, cumulative_us)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+        cwd=BACKEND_DIR,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {target} failed:\n{proc.stderr[-2000:]}")
+
+    rows: List[Tuple[str, int, int]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # header line
+        rows.append((parts[2].strip(), self_us, cumulative_us))
+    return rows
+
+
+def _is_heavy(module: str) -> bool:
+    return any(module == heavy or module.startswith(heavy + ".") for heavy in HEAVY_MODULES)
+
+
+def check(budget_ms: float = 0.0) -> int:
+    failures = 0
+    for target in TARGETS:
+        rows = measure(target)
+        total_ms = next((cumulative for name, _, cumulative in rows if name == target), 0) / 1000
+        heavy = sorted({name for name, _, _ in rows if _is_heavy(name)})
+        slowest = sorted(rows, key=lambda row: row[1], reverse=True)[:5]
+
+        print(f"{target}: {total_ms:.1f} ms cumulative, {len(rows)} modules")
+        for name, self_us, _ in slowest:
+            print(f"    {self_us / 1000:8.1f} ms  {name}")
+        if heavy:
+            failures += 1
+            print(f"  FAIL: eagerly imports {', '.join(heavy[:10])}")
+        if budget_ms and total_ms > budget_ms:
+            failures += 1
+            print(f"  FAIL: over the {budget_ms:.0f} ms import budget")
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if check(float(os.getenv("IMPORT_BUDGET_MS", "0"))) else 0)
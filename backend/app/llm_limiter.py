@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from .config import (LLM_BACKOFF_INITIAL_SECONDS, LLM_BACKOFF_MAX_SECONDS,
+                     LLM_MAX_IN_FLIGHT, LLM_REQUESTS_PER_MINUTE,
+                     LLM_TOKENS_PER_MINUTE)
+from .metrics import LLM_QUEUE_WAIT_SECONDS, LLM_THROTTLED
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(*texts: str) -> int:
+    # Rough chars/4 heuristic; good enough for budgeting against provider TPM limits.
+    return max(1, sum(len(text or "") for text in texts) // 4)
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    text = f"{type(exc).__name__} {exc}".lower()
+    return "429" in text or "resourceexhausted" in text or "resource_exhausted" in text or "rate limit" in text
+
+
+class _TokenBucket:
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = per_minute
+        self._rate = per_minute / 60.0
+        self._tokens = per_minute
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def delay_for(self, amount: float, now: float) -> float:
+        self._refill(now)
+        if self._tokens >= amount:
+            return 0.0
+        return (amount - self._tokens) / self._rate
+
+    def take(self, amount: float) -> None:
+        self._tokens -= amount
+
+
+class LlmRateLimiter:
+    """Per-process governor for model calls: max in flight, requests/min, tokens/min, 429 backoff."""
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        backoff_initial: float,
+        backoff_max: float,
+    ) -> None:
+        self._max_in_flight = max_in_flight
+        self._requests = _TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self._tokens = _TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._backoff_initial = backoff_initial
+        self._backoff_max = backoff_max
+        self._backoff = 0.0
+        self._cooldown_until = 0.0
+        self._last_throttled = 0.0
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._gate: Optional[asyncio.Lock] = None
+
+    def _primitives(self):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._max_in_flight)
+            self._gate = asyncio.Lock()
+        return self._slots, self._gate
+
+    async def _wait_for_budget(self, tokens: int) -> None:
+        while True:
+            now = time.monotonic()
+            wait = self._cooldown_until - now
+            if self._requests is not None:
+                wait = max(wait, self._requests.delay_for(1, now))
+            if self._tokens is not None:
+                wait = max(wait, self._tokens.delay_for(min(tokens, self._tokens.capacity), now))
+            if wait <= 0:
+                if self._requests is not None:
+                    self._requests.take(1)
+                if self._tokens is not None:
+                    self._tokens.take(min(tokens, self._tokens.capacity))
+                return
+            await asyncio.sleep(wait)
+
+    @asynccontextmanager
+    async def slot(self, tokens: int = 1) -> AsyncIterator[None]:
+        slots, gate = self._primitives()
+        started = time.monotonic()
+        await slots.acquire()
+        try:
+            # One waiter at a time drains the buckets, so callers are served in FIFO order.
+            async with gate:
+                await self._wait_for_budget(tokens)
+        except BaseException:
+            slots.release()
+            raise
+
+        waited = time.monotonic() - started
+        LLM_QUEUE_WAIT_SECONDS.observe(waited)
+        if waited > 1:
+            logger.info("LLM call waited %.1fs for rate limit budget", waited)
+
+        call_started = time.monotonic()
+        try:
+            yield
+        except Exception as exc:
+            if is_rate_limit_error(exc):
+                self.report_throttled()
+            raise
+        else:
+            if self._last_throttled < call_started:
+                self._backoff = 0.0
+        finally:
+            slots.release()
+
+    def report_throttled(self) -> None:
+        # Safe to call from worker threads: only plain float assignments.
+        self._backoff = min(self._backoff_max, self._backoff * 2 if self._backoff else self._backoff_initial)
+        self._last_throttled = time.monotonic()
+        self._cooldown_until = max(self._cooldown_until, self._last_throttled + self._backoff)
+        LLM_THROTTLED.inc()
+        logger.warning("LLM provider throttled us; pausing new calls for %.1fs", self._backoff)
+
+
+llm_limiter = LlmRateLimiter(
+    max_in_flight=LLM_MAX_IN_FLIGHT,
+    requests_per_minute=LLM_REQUESTS_PER_MINUTE,
+    tokens_per_minute=LLM_TOKENS_PER_MINUTE,
+    backoff_initial=LLM_BACKOFF_INITIAL_SECONDS,
+    backoff_max=LLM_BACKOFF_MAX_SECONDS,
+)
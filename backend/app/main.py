@@ -2,21 +2,75 @@ import asyncio
 import base64
 import json
 import uuid
+import zipfile
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from fastapi import (BackgroundTasks, Body, FastAPI, File, Form, HTTPException,
-                     UploadFile)
+                     Query, Response, UploadFile)
 from fastapi.middleware.cors import CORSMiddleware
-from temporalio.client import Client
+from temporalio.exceptions import WorkflowAlreadyStartedError
 
-from .activities import evaluate_application
-from .config import TEMPORAL_TARGET, TEMPORAL_TASK_QUEUE, UPLOAD_DIR
-from .workflows import ApplicationWorkflow
+from .bulk_ingest import (BulkBatchTracker, ingest_bulk_archive,
+                          remove_staged_uploads)
+from .config import (BATCH_MAX_APPLICATIONS, BULK_DB_PATH,
+                     BULK_MAX_ARCHIVE_BYTES, BULK_MAX_MANIFEST_BYTES,
+                     BULK_START_CONCURRENCY, MAX_UPLOAD_BYTES, OUTBOX_DB_PATH,
+                     OUTBOX_DRAIN_PER_SECOND, OUTBOX_MAX_ATTEMPTS,
+                     OUTBOX_POLL_SECONDS, SCREENING_BATCH_SIZE,
+                     TEMPORAL_TARGET, TEMPORAL_TASK_QUEUE, UPLOAD_DIR)
+from .metrics import render_latest
+from .outbox import OutboxDrainer, SubmissionOutbox
+from .storage import (SearchUnavailable, count_records_with_id_prefix,
+                      get_application, list_applications,
+                      search_applications)
+from .temporal_client import SharedTemporalClient, is_unavailable
+from .uploads import UploadRejected, copy_pdf, copy_stream
+from .workflows import ApplicationWorkflow, BatchScreeningWorkflow
 
-ALLOWED_CONTENT_TYPES = {"application/pdf"}
+temporal = SharedTemporalClient(TEMPORAL_TARGET)
+outbox = SubmissionOutbox(OUTBOX_DB_PATH, OUTBOX_MAX_ATTEMPTS)
+bulk_tracker = BulkBatchTracker(BULK_DB_PATH)
+_bulk_tasks: Set[asyncio.Task] = set()
 
-app = FastAPI(title="Application Screening API", version="0.1.0")
+
+async def _start_application_workflow(workflow_id: str, payload: Dict[str, Any]) -> None:
+    try:
+        await temporal.start_workflow(
+            ApplicationWorkflow.run,
+            payload,
+            id=workflow_id,
+            task_queue=TEMPORAL_TASK_QUEUE,
+        )
+    except WorkflowAlreadyStartedError:
+        pass
+
+
+outbox_drainer = OutboxDrainer(
+    outbox, _start_application_workflow, OUTBOX_DRAIN_PER_SECOND, OUTBOX_POLL_SECONDS, is_unavailable
+)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    try:
+        await temporal.get()
+    except Exception as exc:
+        print(f"Temporal unavailable at startup ({exc}); submissions will be buffered in the outbox.")
+    interrupted = await asyncio.to_thread(bulk_tracker.fail_interrupted)
+    await asyncio.to_thread(remove_staged_uploads)
+    if interrupted:
+        print(f"Marked {interrupted} bulk batch(es) interrupted by the last shutdown as failed.")
+    drain_task = asyncio.create_task(outbox_drainer.run())
+    outbox_drainer.notify()
+    try:
+        yield
+    finally:
+        drain_task.cancel()
+
+
+app = FastAPI(title="Application Screening API", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -27,30 +81,26 @@ app.add_middleware(
 )
 
 
-def _save_upload(file: UploadFile) -> Path:
-    if file.content_type not in ALLOWED_CONTENT_TYPES:
-        raise HTTPException(status_code=400, detail="Only PDF files are accepted.")
+async def _save_upload(file: UploadFile) -> Tuple[Path, str]:
+    if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"File exceeds the {MAX_UPLOAD_BYTES} byte upload limit.")
 
     safe_name = Path(file.filename or "upload.pdf").name
     destination = UPLOAD_DIR / f"{uuid.uuid4().hex}_{safe_name}"
-    content = file.file.read()
-    destination.write_bytes(content)
-    return destination
+    try:
+        content_hash, _ = await asyncio.to_thread(copy_pdf, file.file, destination)
+    except UploadRejected as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
+    return destination, content_hash
 
 
-async def _trigger_temporal_workflow(payload: dict) -> None:
+async def _trigger_temporal_workflow(payload: dict, workflow_id: Optional[str] = None) -> None:
+    workflow_id = workflow_id or f"application-{payload['email']}-{uuid.uuid4().hex}"
     try:
-        client = await Client.connect(TEMPORAL_TARGET)
-        await client.start_workflow(
-            ApplicationWorkflow.run,
-            payload,
-            # id=f"application-{uuid.uuid4().hex}",
-            id=f"application-{payload['email']}-{uuid.uuid4().hex}",
-            task_queue=TEMPORAL_TASK_QUEUE,
-        )
+        await _start_application_workflow(workflow_id, payload)
     except Exception as exc:
-        print(f"Temporal unavailable ({exc}); running evaluation inline.")
-        await evaluate_application(payload)
+        print(f"Temporal unavailable ({exc}); buffering {workflow_id} in the outbox.")
+        await asyncio.to_thread(outbox.enqueue, workflow_id, payload)
 
 
 @app.post("/api/applications")
@@ -61,12 +111,13 @@ async def submit_application(
     description: str = Form(...),
     file: UploadFile = File(...),
 ):
-    stored_path = _save_upload(file)
+    stored_path, content_hash = await _save_upload(file)
     payload = {
         "email": email,
         "title": title,
         "description": description,
         "file_path": str(stored_path),
+        "resume_sha256": content_hash,
         "source": "web",
     }
 
@@ -75,10 +126,167 @@ async def submit_application(
     return {
         "status": "received",
         "file_path": str(stored_path),
+        "resume_sha256": content_hash,
         "queued_to_task_queue": TEMPORAL_TASK_QUEUE,
     }
 
 
+@app.post("/api/applications/batch")
+async def submit_application_batch(payload: Dict[str, Any] = Body(...)):
+    
+    entries = payload.get("applications")
+    if not isinstance(entries, list) or not entries:
+        raise HTTPException(status_code=400, detail="Expected a non-empty 'applications' list.")
+    if len(entries) > BATCH_MAX_APPLICATIONS:
+        raise HTTPException(status_code=413, detail=f"At most {BATCH_MAX_APPLICATIONS} applications per batch.")
+
+    applications = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not entry.get("email"):
+            raise HTTPException(status_code=400, detail=f"Application {index} is missing an email.")
+        applications.append(
+            {
+                "email": str(entry["email"]),
+                "title": str(entry.get("title") or "(no title)"),
+                "description": str(entry.get("description") or ""),
+                "file_path": None,
+                "source": str(entry.get("source") or "batch"),
+            }
+        )
+
+    batch_id = f"batch-{uuid.uuid4().hex}"
+    try:
+        await temporal.start_workflow(
+            BatchScreeningWorkflow.run,
+            {"applications": applications, "batch_size": SCREENING_BATCH_SIZE},
+            id=batch_id,
+            task_queue=TEMPORAL_TASK_QUEUE,
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=503, detail=f"Temporal unavailable: {exc}")
+
+    return {"status": "queued", "batch_id": batch_id, "count": len(applications)}
+
+
+async def _stage_upload(file: UploadFile, suffix: str, max_bytes: int) -> Path:
+    staged = UPLOAD_DIR / f".bulk-{uuid.uuid4().hex}{suffix}"
+    try:
+        await asyncio.to_thread(copy_stream, file.file, staged, max_bytes)
+    except UploadRejected as exc:
+        staged.unlink(missing_ok=True)
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
+    return staged
+
+
+@app.post("/api/applications/bulk")
+async def submit_bulk_applications(
+    archive: UploadFile = File(...),
+    manifest: Optional[UploadFile] = File(None),
+):
+    
+    archive_path = await _stage_upload(archive, ".zip", BULK_MAX_ARCHIVE_BYTES)
+    if not await asyncio.to_thread(zipfile.is_zipfile, archive_path):
+        archive_path.unlink(missing_ok=True)
+        raise HTTPException(status_code=400, detail="Archive must be a ZIP file.")
+
+    manifest_path: Optional[Path] = None
+    manifest_name = ""
+    handed_off = False
+    try:
+        if manifest is not None:
+            manifest_name = manifest.filename or "manifest.csv"
+            manifest_path = await _stage_upload(manifest, Path(manifest_name).suffix, BULK_MAX_MANIFEST_BYTES)
+
+        batch_id = f"bulk-{uuid.uuid4().hex}"
+        await asyncio.to_thread(bulk_tracker.create, batch_id)
+        task = asyncio.create_task(
+            ingest_bulk_archive(
+                batch_id=batch_id,
+                archive_path=archive_path,
+                manifest_path=manifest_path,
+                manifest_name=manifest_name,
+                tracker=bulk_tracker,
+                start=lambda workflow_id, payload: _trigger_temporal_workflow(payload, workflow_id),
+                concurrency=BULK_START_CONCURRENCY,
+            )
+        )
+        # From here on the ingest task owns (and removes) the staged files.
+        handed_off = True
+    finally:
+        if not handed_off:
+            archive_path.unlink(missing_ok=True)
+            if manifest_path is not None:
+                manifest_path.unlink(missing_ok=True)
+    _bulk_tasks.add(task)
+    task.add_done_callback(_bulk_tasks.discard)
+    return {"status": "accepted", "batch_id": batch_id}
+
+
+@app.get("/api/applications/bulk/{batch_id}")
+async def bulk_batch_status(batch_id: str) -> dict:
+    status = await asyncio.to_thread(bulk_tracker.get, batch_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Unknown batch id.")
+    status.update(await asyncio.to_thread(count_records_with_id_prefix, f"{batch_id}-"))
+    return status
+
+
+@app.get("/api/applications")
+async def list_screened_applications(
+    qualifies: Optional[bool] = None,
+    decision: Optional[str] = None,
+    min_score: Optional[int] = Query(None, ge=0, le=100),
+    max_score: Optional[int] = Query(None, ge=0, le=100),
+    evaluated_after: Optional[str] = Query(None, description="ISO timestamp or date, inclusive"),
+    evaluated_before: Optional[str] = Query(None, description="ISO timestamp or date, exclusive"),
+    email: Optional[str] = None,
+    source: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+) -> dict:
+    filters = {
+        "qualifies": qualifies,
+        "decision": decision,
+        "min_score": min_score,
+        "max_score": max_score,
+        "evaluated_after": evaluated_after,
+        "evaluated_before": evaluated_before,
+        "email": email,
+        "source": source,
+    }
+    try:
+        return await asyncio.to_thread(list_applications, filters, limit, cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@app.get("/api/applications/{application_id}")
+async def get_screened_application(application_id: str) -> dict:
+    record = await asyncio.to_thread(get_application, application_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Unknown application id.")
+    return record
+
+
+@app.get("/api/search")
+async def search_screened_applications(
+    q: str = Query("", description="Free-text terms; a trailing * matches a prefix"),
+    skill: List[str] = Query([], description="Required candidate skill, repeatable"),
+    match: str = Query("all", pattern="^(all|any)$"),
+    qualifies: Optional[bool] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[int] = Query(None, ge=0),
+) -> dict:
+    try:
+        return await asyncio.to_thread(
+            search_applications, q, skill, match == "all", qualifies, limit, cursor or 0
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except SearchUnavailable as exc:
+        raise HTTPException(status_code=501, detail=str(exc))
+
+
 def _extract_gmail_payload(raw: Dict[str, Any]) -> Dict[str, str]:
    
     if "message" in raw and isinstance(raw["message"], dict):
@@ -125,4 +333,31 @@ async def gmail_webhook(background_tasks: BackgroundTasks, payload: Dict[str, An
 
 @app.get("/health")
 async def health() -> dict:
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "temporal": await temporal.health(),
+        "outbox": await asyncio.to_thread(outbox.stats),
+    }
+
+
+@app.get("/api/outbox/dead")
+async def list_dead_submissions(limit: int = Query(100, ge=1, le=1000)) -> dict:
+    return {"items": await asyncio.to_thread(outbox.dead_entries, limit)}
+
+
+@app.post("/api/outbox/requeue")
+async def requeue_dead_submissions(payload: Dict[str, Any] = Body(default={})) -> dict:
+    # {"workflow_ids": [...]} re-drives just those entries; an empty body re-drives all of them.
+    workflow_ids = payload.get("workflow_ids")
+    if workflow_ids is not None and not isinstance(workflow_ids, list):
+        raise HTTPException(status_code=400, detail="'workflow_ids' must be a list.")
+    requeued = await asyncio.to_thread(outbox.requeue_dead, workflow_ids)
+    if requeued:
+        outbox_drainer.notify()
+    return {"requeued": requeued}
+
+
+@app.get("/metrics")
+async def metrics() -> Response:
+    content, content_type = render_latest()
+    return Response(content=content, media_type=content_type)
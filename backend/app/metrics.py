@@ -0,0 +1,106 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from prometheus_client import (CONTENT_TYPE_LATEST, Counter, Histogram,
+                                   generate_latest, start_http_server)
+
+    PROMETHEUS_AVAILABLE = True
+except ImportError:  # metrics become no-ops without prometheus_client
+    PROMETHEUS_AVAILABLE = False
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+SCORE_BUCKETS = (0.1, 0.2, 0.3, 0.35, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+
+class _NoopMetric:
+    def labels(self, *args, **kwargs) -> "_NoopMetric":
+        return self
+
+    def observe(self, value: float) -> None:
+        pass
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+
+def _histogram(name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+    if not PROMETHEUS_AVAILABLE:
+        return _NoopMetric()
+    return Histogram(name, documentation, labels, buckets=buckets)
+
+
+def _counter(name: str, documentation: str, labels: Sequence[str] = ()):
+    if not PROMETHEUS_AVAILABLE:
+        return _NoopMetric()
+    return Counter(name, documentation, labels)
+
+
+PDF_EXTRACT_SECONDS = _histogram(
+    "screening_pdf_extract_seconds", "Resume text extraction time, including cache lookups.", ["outcome"]
+)
+LLM_CALL_SECONDS = _histogram(
+    "screening_llm_call_seconds", "Model call latency per pipeline stage.", ["stage", "outcome"]
+)
+LLM_QUEUE_WAIT_SECONDS = _histogram(
+    "screening_llm_queue_wait_seconds", "Time spent waiting on the LLM rate limiter."
+)
+LLM_THROTTLED = _counter("screening_llm_throttled", "Provider rate-limit (429) responses.")
+SCREENING_RESULTS = _counter(
+    "screening_results", "Screening outcomes by the path that produced them.", ["path", "qualifies"]
+)
+PRESCREEN_DECISIONS = _counter(
+    "screening_prescreen_decisions", "Pre-screen outcomes: reject/accept are final, llm goes to the model.", ["decision"]
+)
+PRESCREEN_SCORE = _histogram("screening_prescreen_score", "Pre-screen fit scores.", buckets=SCORE_BUCKETS)
+STORAGE_SECONDS = _histogram("screening_storage_seconds", "Record store operation time.", ["operation"])
+SMTP_SEND_SECONDS = _histogram("screening_smtp_send_seconds", "SMTP send time per call.", ["mode"])
+EMAILS = _counter("screening_emails", "Notification emails by outcome.", ["outcome"])
+
+
+@contextmanager
+def timed(histogram, **labels: str) -> Iterator[Dict[str, str]]:
+    """Observe elapsed time on exit; callers may overwrite labels (e.g. outcome) inside the block."""
+    started = time.perf_counter()
+    try:
+        yield labels
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - started)
+
+
+def screening_path(analysis: Dict) -> str:
+    if analysis.get("prescreened"):
+        return "prescreen"
+    if analysis.get("cache_hit"):
+        return "cache"
+    if analysis.get("batched"):
+        return "batch"
+    if analysis.get("candidate_profile") is not None:
+        return "adk"
+    if analysis.get("used_gemini"):
+        return "gemini"
+    return "keyword"
+
+
+def record_screening(analysis: Dict) -> None:
+    SCREENING_RESULTS.labels(
+        path=screening_path(analysis), qualifies=str(bool(analysis.get("qualifies"))).lower()
+    ).inc()
+
+
+def render_latest() -> Tuple[bytes, str]:
+    if not PROMETHEUS_AVAILABLE:
+        return b"# prometheus_client is not installed\n", "text/plain; charset=utf-8"
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: int) -> bool:
+    if not PROMETHEUS_AVAILABLE or not port:
+        return False
+    start_http_server(port)
+    logger.info("Serving Prometheus metrics on :%s", port)
+    return True
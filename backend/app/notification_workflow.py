@@ -1,42 +1,93 @@
+import asyncio
 from datetime import timedelta
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from temporalio import workflow
+from temporalio.exceptions import TimeoutError as ActivityTimeoutError
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_MAX_PARALLEL = 4
+DEFAULT_PAGE_SIZE = 200
+DEFAULT_PAGES_PER_RUN = 10
+# Worst case for one page: fetch, send every batch, then mark what went out.
+PAGE_BUDGET = timedelta(minutes=7)
+
+
+def _heartbeated_sent_ids(error: BaseException) -> List[str]:
+    # A batch that timed out still reports, in its last heartbeat, the rows it had already sent.
+    cause = getattr(error, "cause", None)
+    if isinstance(cause, ActivityTimeoutError) and cause.last_heartbeat_details:
+        return list((cause.last_heartbeat_details[0] or {}).get("sent_ids", []))
+    return []
 
 
 @workflow.defn
 class NotifyFailedWorkflow:
     @workflow.run
-    async def run(self) -> Dict:
-        to_notify_resp = await workflow.execute_activity(
-            "fetch_unnotified_failed",
-            {},
-            schedule_to_close_timeout=timedelta(minutes=2),
-        )
-        rows: List[Dict] = to_notify_resp.get("rows", [])
-        sent_ids: List[str] = []
-        results: List[Dict] = []
-
-        for row in rows:
-            res = await workflow.execute_activity(
-                "send_failed_email",
-                {
-                    "email": row.get("email"),
-                    "reason": row.get("analysis", {}).get("reason", ""),
-                },
+    async def run(self, options: Optional[Dict] = None) -> Dict:
+        options = options or {}
+        batch_size = max(1, int(options.get("batch_size", DEFAULT_BATCH_SIZE)))
+        max_parallel = max(1, int(options.get("max_parallel", DEFAULT_MAX_PARALLEL)))
+        page_size = max(1, int(options.get("page_size", DEFAULT_PAGE_SIZE)))
+        pages_per_run = max(1, int(options.get("pages_per_run", DEFAULT_PAGES_PER_RUN)))
+        cursor: Optional[int] = options.get("cursor")
+        totals: Dict[str, int] = {"notified": 0, "attempts": 0, "failed": 0, "pages": 0}
+        totals.update(options.get("totals") or {})
+        # run_timeout bounds each run of the continue-as-new chain: stop paging while a whole
+        # page still fits, and let the next run pick up from the cursor.
+        run_timeout = workflow.info().run_timeout
+        run_deadline = workflow.now() + run_timeout if run_timeout else None
+
+        slots = asyncio.Semaphore(max_parallel)
+
+        async def send_batch(batch: List[Dict]) -> Dict:
+            async with slots:
+                return await workflow.execute_activity(
+                    "send_failed_emails_batch",
+                    {"rows": batch},
+                    schedule_to_close_timeout=timedelta(minutes=4),
+                    # The activity heartbeats after every message; a hung relay fails fast and
+                    # the retry resumes from the last checkpoint.
+                    heartbeat_timeout=timedelta(minutes=1),
+                )
+
+        for page_number in range(pages_per_run):
+            if page_number and run_deadline and workflow.now() + PAGE_BUDGET > run_deadline:
+                break
+            page = await workflow.execute_activity(
+                "fetch_unnotified_failed",
+                {"limit": page_size, "cursor": cursor, "compact": True},
                 schedule_to_close_timeout=timedelta(minutes=2),
             )
-            results.append(res)
-            if res.get("sent"):
-                if row.get("id"):
-                    sent_ids.append(row["id"])
-
-        if sent_ids:
-            await workflow.execute_activity(
-                "mark_failed_as_notified",
-                {"ids": sent_ids},
-                schedule_to_close_timeout=timedelta(minutes=1),
-            )
+            rows: List[Dict] = page.get("rows", [])
+            if not rows:
+                return totals
+
+            batches = [rows[start:start + batch_size] for start in range(0, len(rows), batch_size)]
+            outcomes = await asyncio.gather(*(send_batch(batch) for batch in batches), return_exceptions=True)
+            results: List[Dict] = [res for res in outcomes if not isinstance(res, BaseException)]
+            errors = [res for res in outcomes if isinstance(res, BaseException)]
+            sent_ids: List[str] = [failure_id for res in results for failure_id in res.get("sent_ids", [])]
+            sent_ids += [failure_id for error in errors for failure_id in _heartbeated_sent_ids(error)]
+
+            # Checkpoint each page so a timeout or restart never re-sends what already went out,
+            # including what a failed batch and the other batches sent before it failed.
+            if sent_ids:
+                await workflow.execute_activity(
+                    "mark_failed_as_notified",
+                    {"ids": sent_ids},
+                    schedule_to_close_timeout=timedelta(minutes=1),
+                )
+            if errors:
+                raise errors[0]
+
+            totals["pages"] += 1
+            totals["attempts"] += len(rows)
+            totals["notified"] += len(sent_ids)
+            totals["failed"] += sum(res.get("failed", 0) for res in results)
 
-        return {"notified": sent_ids, "attempts": len(rows), "results": results}
+            cursor = page.get("next_cursor")
+            if cursor is None:
+                return totals
 
+        workflow.continue_as_new({**options, "cursor": cursor, "totals": totals})
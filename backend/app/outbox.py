@@ -0,0 +1,166 @@
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .sqlite_store import SqliteStore, utcnow
+from .temporal_client import StartFn
+
+logger = logging.getLogger(__name__)
+
+_OUTBOX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    workflow_id TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    dead INTEGER NOT NULL DEFAULT 0,
+    enqueued_at TEXT NOT NULL
+);
+"""
+
+
+class SubmissionOutbox(SqliteStore):
+    """On-disk FIFO of workflow starts that could not reach Temporal."""
+
+    schema = _OUTBOX_SCHEMA
+
+    def __init__(self, db_path: Path, max_attempts: int) -> None:
+        super().__init__(db_path)
+        self._max_attempts = max_attempts
+
+    def enqueue(self, workflow_id: str, payload: Dict) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO outbox (workflow_id, payload, enqueued_at) VALUES (?, ?, ?)",
+                    (workflow_id, json.dumps(payload), utcnow()),
+                )
+
+    def peek(self, limit: int) -> List[Dict]:
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT seq, workflow_id, payload FROM outbox WHERE dead = 0 ORDER BY seq LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [{"seq": seq, "workflow_id": wf_id, "payload": json.loads(payload)} for seq, wf_id, payload in rows]
+
+    def remove(self, seq: int) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM outbox WHERE seq = ?", (seq,))
+
+    def record_failure(self, seq: int, error: str, count_attempt: bool = True) -> None:
+        # Only failures caused by the entry itself count towards max_attempts.
+        increment = 1 if count_attempt else 0
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "UPDATE outbox SET attempts = attempts + ?, last_error = ?, "
+                    "dead = CASE WHEN attempts + ? >= ? THEN 1 ELSE 0 END WHERE seq = ?",
+                    (increment, error, increment, self._max_attempts, seq),
+                )
+
+    def dead_entries(self, limit: int) -> List[Dict]:
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT workflow_id, attempts, last_error, enqueued_at FROM outbox WHERE dead = 1 ORDER BY seq LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [
+            {"workflow_id": wf_id, "attempts": attempts, "last_error": error, "enqueued_at": enqueued_at}
+            for wf_id, attempts, error, enqueued_at in rows
+        ]
+
+    def requeue_dead(self, workflow_ids: Optional[List[str]] = None) -> int:
+        """Give dead entries (all, or just `workflow_ids`) a fresh set of attempts."""
+        query = "UPDATE outbox SET dead = 0, attempts = 0 WHERE dead = 1"
+        params: List[str] = []
+        if workflow_ids is not None:
+            query += f" AND workflow_id IN ({', '.join('?' * len(workflow_ids))})"
+            params = list(workflow_ids)
+            if not params:
+                return 0
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                return conn.execute(query, params).rowcount
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            pending, dead = self._connect().execute(
+                "SELECT COALESCE(SUM(dead = 0), 0), COALESCE(SUM(dead = 1), 0) FROM outbox"
+            ).fetchone()
+        return {"pending": pending, "dead": dead}
+
+
+def _never_transient(_: BaseException) -> bool:
+    return False
+
+
+class OutboxDrainer:
+    """Background task that replays buffered submissions into Temporal at a bounded rate."""
+
+    def __init__(
+        self,
+        outbox: SubmissionOutbox,
+        start: StartFn,
+        per_second: float,
+        poll_seconds: float,
+        is_transient: Callable[[BaseException], bool] = _never_transient,
+    ) -> None:
+        self._outbox = outbox
+        self._start = start
+        self._is_transient = is_transient
+        self._interval = 1.0 / per_second if per_second > 0 else 0.0
+        self._poll_seconds = poll_seconds
+        self._wake = asyncio.Event()
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self._poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                drained = await self.drain_once()
+            except Exception as exc:  # noqa: BLE001 - keep the drainer alive
+                logger.error("Outbox drain failed: %s", exc)
+                continue
+            if drained:
+                logger.info("Drained %s buffered submissions into Temporal", drained)
+
+    async def drain_once(self, batch_size: int = 50) -> int:
+        drained = 0
+        while True:
+            entries = await asyncio.to_thread(self._outbox.peek, batch_size)
+            if not entries:
+                return drained
+            rejected = False
+            for entry in entries:
+                try:
+                    await self._start(entry["workflow_id"], entry["payload"])
+                except Exception as exc:
+                    if self._is_transient(exc):
+                        # Temporal is still down: not this entry's fault, so it costs no attempt.
+                        await asyncio.to_thread(self._outbox.record_failure, entry["seq"], str(exc), False)
+                        return drained
+                    await asyncio.to_thread(self._outbox.record_failure, entry["seq"], str(exc))
+                    # Let the entries behind it through; the rejected one is retried on the next poll.
+                    rejected = True
+                    continue
+                await asyncio.to_thread(self._outbox.remove, entry["seq"])
+                drained += 1
+                if self._interval:
+                    await asyncio.sleep(self._interval)
+            if rejected:
+                return drained
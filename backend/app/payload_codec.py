@@ -0,0 +1,95 @@
+import asyncio
+import dataclasses
+import hashlib
+import logging
+import zlib
+from pathlib import Path
+from typing import List, Sequence
+from uuid import uuid4
+
+import temporalio.converter
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import DataConverter, PayloadCodec
+
+from .config import (BLOB_STORE_DIR, PAYLOAD_CLAIM_CHECK_MIN_BYTES,
+                     PAYLOAD_COMPRESS_MIN_BYTES)
+
+logger = logging.getLogger(__name__)
+
+ZLIB_ENCODING = b"binary/zlib"
+CLAIM_CHECK_ENCODING = b"claim-check/sha256"
+
+
+class BlobStore:
+    """Content-addressed files under `root`; identical blobs are stored once."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def put(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{digest}.{uuid4().hex}.tmp")
+            tmp_path.write_bytes(data)
+            tmp_path.replace(path)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        data = self._path(digest).read_bytes()
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Blob {digest} is corrupt")
+        return data
+
+
+class ScreeningPayloadCodec(PayloadCodec):
+    """Compresses large payloads and, past a second threshold, swaps them for a blob reference.
+
+    Every worker, API process and client must use this codec (see `data_converter`), and
+    claim-checked blobs are only readable by processes that share BLOB_STORE_DIR.
+    """
+
+    def __init__(self, store: BlobStore, compress_min_bytes: int, claim_check_min_bytes: int) -> None:
+        self.store = store
+        self.compress_min_bytes = compress_min_bytes
+        self.claim_check_min_bytes = claim_check_min_bytes
+
+    async def encode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        return [await self._encode_one(payload) for payload in payloads]
+
+    async def decode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        return [await self._decode_one(payload) for payload in payloads]
+
+    async def _encode_one(self, payload: Payload) -> Payload:
+        data = payload.SerializeToString()
+        if self.compress_min_bytes and len(data) >= self.compress_min_bytes:
+            compressed = zlib.compress(data, 6)
+            if len(compressed) < len(data):
+                payload = Payload(metadata={"encoding": ZLIB_ENCODING}, data=compressed)
+                data = payload.SerializeToString()
+        if self.claim_check_min_bytes and len(data) >= self.claim_check_min_bytes:
+            digest = await asyncio.to_thread(self.store.put, data)
+            payload = Payload(metadata={"encoding": CLAIM_CHECK_ENCODING}, data=digest.encode("ascii"))
+        return payload
+
+    async def _decode_one(self, payload: Payload) -> Payload:
+        # Undo the layers in reverse; payloads written without the codec pass straight through.
+        while True:
+            encoding = payload.metadata.get("encoding", b"")
+            if encoding == CLAIM_CHECK_ENCODING:
+                data = await asyncio.to_thread(self.store.get, payload.data.decode("ascii"))
+            elif encoding == ZLIB_ENCODING:
+                data = zlib.decompress(payload.data)
+            else:
+                return payload
+            payload = Payload.FromString(data)
+
+
+def data_converter() -> DataConverter:
+    # Installed even with both thresholds at 0 so payloads encoded earlier still decode.
+    codec = ScreeningPayloadCodec(BlobStore(BLOB_STORE_DIR), PAYLOAD_COMPRESS_MIN_BYTES, PAYLOAD_CLAIM_CHECK_MIN_BYTES)
+    return dataclasses.replace(temporalio.converter.default(), payload_codec=codec)
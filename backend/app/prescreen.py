@@ -0,0 +1,123 @@
+import re
+from typing import Dict, List, Optional
+
+from .config import (PRESCREEN_ACCEPT_AT, PRESCREEN_ENABLED,
+                     PRESCREEN_REJECT_BELOW, PRESCREEN_SENIOR_YEARS)
+from .metrics import PRESCREEN_DECISIONS, PRESCREEN_SCORE
+
+# Required skills for the Senior Full-Stack role, with the spellings applicants actually use.
+REQUIRED_SKILLS: Dict[str, List[str]] = {
+    "react": [r"react", r"react[\s.\-]?js"],
+    "node": [r"node", r"node[\s.\-]?js"],
+}
+SENIORITY_TERMS = [r"senior", r"sr\.?", r"lead", r"principal", r"staff"]
+
+SKILL_WEIGHT = 0.7
+SENIORITY_WEIGHT = 0.3
+
+
+def _word_pattern(alternatives: List[str]) -> "re.Pattern[str]":
+    # Longest spelling first so "react.js" is consumed whole rather than as "react" + ".js".
+    ordered = sorted(alternatives, key=len, reverse=True)
+    return re.compile(r"(?<![\w.])(?:" + "|".join(ordered) + r")(?![\w])", re.IGNORECASE)
+
+
+_SKILL_PATTERNS = {skill: _word_pattern(spellings) for skill, spellings in REQUIRED_SKILLS.items()}
+_SENIORITY_PATTERN = _word_pattern(SENIORITY_TERMS)
+_YEARS_PATTERN = re.compile(r"\b(\d{1,2})\s*\+?\s*(?:years?|yrs?)\b", re.IGNORECASE)
+
+
+def missing_skills(text: str) -> List[str]:
+    return [skill for skill, pattern in _SKILL_PATTERNS.items() if not pattern.search(text)]
+
+
+def years_of_experience(text: str) -> Optional[int]:
+    years = [int(match) for match in _YEARS_PATTERN.findall(text)]
+    return max(years) if years else None
+
+
+def score_text(text: str) -> Dict:
+    """Deterministic 0..1 fit score: required skills by word match, plus a seniority signal."""
+    missing = missing_skills(text)
+    years = years_of_experience(text)
+    senior = bool(_SENIORITY_PATTERN.search(text)) or (years is not None and years >= PRESCREEN_SENIOR_YEARS)
+    matched = len(REQUIRED_SKILLS) - len(missing)
+    score = SKILL_WEIGHT * matched / len(REQUIRED_SKILLS) + (SENIORITY_WEIGHT if senior else 0.0)
+    return {
+        "score": round(score, 3),
+        "missing_keywords": missing,
+        "senior_signal": senior,
+        "years_experience": years,
+    }
+
+
+def prescreen(text: str, file_path: str = "", resume_unreadable: bool = False) -> Dict:
+    """Score an application and decide `reject`, `accept` (both final) or `llm` (needs the model).
+
+    Returns the scoring details under "prescreen"; for final decisions "analysis" holds a
+    complete screening result in the shape the model paths produce. `resume_unreadable`
+    (a resume was attached but yielded no text) always defers to the model: the score would
+    only reflect the form fields.
+    """
+    scored = score_text(text)
+    if not PRESCREEN_ENABLED or resume_unreadable:
+        decision = "llm"
+    elif scored["score"] < PRESCREEN_REJECT_BELOW:
+        decision = "reject"
+    elif PRESCREEN_ACCEPT_AT and scored["score"] >= PRESCREEN_ACCEPT_AT:
+        decision = "accept"
+    else:
+        decision = "llm"
+    PRESCREEN_DECISIONS.labels(decision=decision).inc()
+    PRESCREEN_SCORE.observe(scored["score"])
+
+    details = {
+        **scored,
+        "decision": decision,
+        "resume_unreadable": resume_unreadable,
+        "reject_below": PRESCREEN_REJECT_BELOW,
+        "accept_at": PRESCREEN_ACCEPT_AT,
+    }
+    analysis = None
+    if decision != "llm":
+        qualifies = decision == "accept"
+        analysis = {
+            "qualifies": qualifies,
+            "reason": (
+                "Matches senior full-stack criteria with React, Node.js."
+                if qualifies
+                else _rejection_reason(scored)
+            ),
+            "missing_keywords": scored["missing_keywords"],
+            "used_gemini": False,
+            "prescreened": True,
+            "prescreen": details,
+            "file_path": file_path,
+        }
+    return {"prescreen": details, "analysis": analysis}
+
+
+def _rejection_reason(scored: Dict) -> str:
+    gaps = []
+    if scored["missing_keywords"]:
+        gaps.append("no mention of " + ", ".join(scored["missing_keywords"]))
+    if not scored["senior_signal"]:
+        gaps.append("no senior-level signal")
+    return "Pre-screen: " + "; ".join(gaps) + "." if gaps else "Pre-screen score below threshold."
+
+
+def keyword_screen(text: str, file_path: str = "") -> Dict:
+    # Last-resort verdict when no model is available: every required skill plus seniority.
+    scored = score_text(text)
+    qualifies = scored["senior_signal"] and not scored["missing_keywords"]
+    return {
+        "qualifies": qualifies,
+        "reason": (
+            "Matches senior full-stack criteria with React, Node.js."
+            if qualifies
+            else "Missing senior signal or required keywords."
+        ),
+        "missing_keywords": scored["missing_keywords"],
+        "used_gemini": False,
+        "file_path": file_path,
+    }
@@ -0,0 +1,109 @@
+import re
+from collections import Counter
+from typing import List
+
+from .config import DESCRIPTION_TOKEN_BUDGET, RESUME_TOKEN_BUDGET
+from .resume_text import PAGE_BREAK
+
+# Same chars-per-token ratio as llm_limiter.estimate_tokens, so budgets and limiter agree.
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARK = "[...]"
+# Lines this close to the top or bottom of a page are header/footer candidates.
+EDGE_LINES = 2
+
+_BOILERPLATE_LINE = re.compile(
+    r"^(?:page\s*\d+(?:\s*(?:of|/)\s*\d+)?|curriculum\s+vitae|r[eé]sum[eé]|cv"
+    r"|references\s+(?:are\s+)?available\s+(?:up)?on\s+request\.?|confidential)$",
+    re.IGNORECASE,
+)
+# A bare number is only a page number as the first or last line of a page; elsewhere it is
+# content (a "10" under "Years of experience").
+_PAGE_NUMBER_LINE = re.compile(r"^[-–—\s]*\d{1,3}[-–—\s]*$")
+_INLINE_SPACE = re.compile(r"[ \t\u00a0\u2000-\u200b\u202f\u3000]+")
+_DIGITS = re.compile(r"\d+")
+
+
+def _line_key(line: str) -> str:
+    # "Page 2 of 3" and "Page 3 of 3" are the same footer.
+    return _DIGITS.sub("#", line.lower())
+
+
+def _normalize_lines(text: str) -> List[str]:
+    lines = []
+    for raw in text.splitlines():
+        line = _INLINE_SPACE.sub(" ", raw).strip()
+        if line and _BOILERPLATE_LINE.match(line):
+            continue
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    while lines and not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def _drop_page_numbers(lines: List[str]) -> List[str]:
+    content = [index for index, line in enumerate(lines) if line]
+    edges = {content[0], content[-1]} if content else set()
+    return [line for index, line in enumerate(lines) if index not in edges or not _PAGE_NUMBER_LINE.match(line)]
+
+
+def _drop_page_furniture(pages: List[List[str]]) -> List[str]:
+    """Keep only the first copy of headers/footers that repeat across most pages."""
+    furniture = set()
+    if len(pages) > 1:
+        edges: Counter = Counter()
+        for lines in pages:
+            edges.update(
+                {
+                    _line_key(line)
+                    for line in lines[:EDGE_LINES] + lines[-EDGE_LINES:]
+                    if line and not _PAGE_NUMBER_LINE.match(line)
+                }
+            )
+        threshold = max(2, (len(pages) + 1) // 2)
+        furniture = {key for key, count in edges.items() if count >= threshold}
+
+    kept: List[str] = []
+    seen = set()
+    for lines in pages:
+        for line in lines:
+            key = _line_key(line)
+            if key in furniture:
+                if key in seen:
+                    continue
+                seen.add(key)
+            if line or (kept and kept[-1]):
+                kept.append(line)
+    return kept
+
+
+def cap_tokens(text: str, budget_tokens: int) -> str:
+    limit = budget_tokens * CHARS_PER_TOKEN
+    if budget_tokens <= 0 or len(text) <= limit:
+        return text
+    cut = text.rfind("\n", 0, limit - len(TRUNCATION_MARK))
+    if cut < limit // 2:
+        cut = limit - len(TRUNCATION_MARK)
+    return text[:cut].rstrip() + "\n" + TRUNCATION_MARK
+
+
+def condense_text(text: str, budget_tokens: int) -> str:
+    return cap_tokens("\n".join(_normalize_lines(text)), budget_tokens)
+
+
+def condense_resume(text: str, budget_tokens: int = RESUME_TOKEN_BUDGET) -> str:
+    """Whitespace-normalized resume text without boilerplate or repeated page headers/footers,
+    capped to `budget_tokens`."""
+    pages = [_drop_page_numbers(_normalize_lines(page)) for page in (text or "").split(PAGE_BREAK)]
+    return cap_tokens("\n".join(_drop_page_furniture(pages)), budget_tokens)
+
+
+def build_application_prompt(title: str, description: str, resume_text: str) -> str:
+    sections = [
+        f"Title: {condense_text(title, DESCRIPTION_TOKEN_BUDGET)}",
+        f"Description:\n{condense_text(description, DESCRIPTION_TOKEN_BUDGET)}",
+    ]
+    resume = condense_resume(resume_text)
+    if resume:
+        sections.append(f"Resume:\n{resume}")
+    return "\n\n".join(sections)
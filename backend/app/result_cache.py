@@ -0,0 +1,82 @@
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from .config import SCREENING_CACHE_PATH, SCREENING_CACHE_TTL_SECONDS
+from .sqlite_store import SqliteStore, utcnow
+
+_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS screening_results (
+    cache_key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    cached_at TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_screening_results_expiry ON screening_results (expires_at);
+"""
+
+
+def _normalize(text: str) -> str:
+    return " ".join((text or "").split()).casefold()
+
+
+def screening_cache_key(version: str, email: str, title: str, description: str, resume_hash: str) -> str:
+    # The email is part of the key: results carry the applicant's profile, so they are only
+    # ever reused for the same applicant resubmitting the same application.
+    material = json.dumps([version, _normalize(email), _normalize(title), _normalize(description), resume_hash or ""])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ScreeningResultCache(SqliteStore):
+    """Persistent TTL cache of LLM screening results, keyed by prompt version, applicant and application content."""
+
+    schema = _CACHE_SCHEMA
+
+    def __init__(self, db_path: Path, ttl_seconds: float) -> None:
+        super().__init__(db_path)
+        self._ttl_seconds = ttl_seconds
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl_seconds > 0
+
+    def get(self, cache_key: str) -> Optional[Dict]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT result, cached_at FROM screening_results WHERE cache_key = ? AND expires_at > ?",
+                (cache_key, time.time()),
+            ).fetchone()
+        if row is None:
+            return None
+        result = json.loads(row[0])
+        result["cache_hit"] = True
+        result["cached_at"] = row[1]
+        return result
+
+    def put(self, cache_key: str, result: Dict) -> None:
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM screening_results WHERE expires_at <= ?", (now,))
+                conn.execute(
+                    "INSERT OR REPLACE INTO screening_results (cache_key, result, cached_at, expires_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (cache_key, json.dumps(result), utcnow(), now + self._ttl_seconds),
+                )
+
+
+_cache: Optional[ScreeningResultCache] = None
+
+
+def get_result_cache() -> ScreeningResultCache:
+    global _cache
+    if _cache is None:
+        _cache = ScreeningResultCache(SCREENING_CACHE_PATH, SCREENING_CACHE_TTL_SECONDS)
+    return _cache
@@ -0,0 +1,223 @@
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import threading
+from collections import OrderedDict
+from multiprocessing.connection import Connection
+from multiprocessing.context import BaseContext
+from pathlib import Path
+from typing import Optional, Set
+from uuid import uuid4
+
+from .config import (PDF_EXTRACT_TIMEOUT_SECONDS, PDF_EXTRACT_WORKERS,
+                     PDF_MAX_BYTES, PDF_MAX_PAGES, RESUME_TEXT_CACHE_DIR,
+                     RESUME_TEXT_CACHE_SIZE)
+from .metrics import PDF_EXTRACT_SECONDS, timed
+
+logger = logging.getLogger(__name__)
+
+_memory_cache: "OrderedDict[str, str]" = OrderedDict()
+_memory_lock = threading.Lock()
+
+# Separates pages in extracted text, so later stages can spot repeated headers/footers.
+PAGE_BREAK = "\f"
+
+_mp_context: Optional[BaseContext] = None
+_parse_slots: Optional[asyncio.Semaphore] = None
+_live_parsers: "Set[multiprocessing.process.BaseProcess]" = set()
+_live_parsers_lock = threading.Lock()
+
+
+class ExtractionUnavailable(RuntimeError):
+    """The parser process died for reasons other than the document; the caller should retry."""
+
+
+def file_sha256(file_path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _parse_pdf(file_path: Path, max_pages: int = PDF_MAX_PAGES) -> str:
+    from pypdf import PdfReader
+
+    reader = PdfReader(str(file_path))
+    pages = [page.extract_text() or "" for page in reader.pages[:max_pages]]
+    return PAGE_BREAK.join(pages)
+
+
+def _check_size(file_path: Path) -> None:
+    size = file_path.stat().st_size
+    if size > PDF_MAX_BYTES:
+        raise ValueError(f"Resume is {size} bytes, over the {PDF_MAX_BYTES} byte limit")
+
+
+def _sidecar_path(content_hash: str) -> Path:
+    return RESUME_TEXT_CACHE_DIR / f"{content_hash}.txt"
+
+
+def get_cached_text(content_hash: str) -> Optional[str]:
+    with _memory_lock:
+        if content_hash in _memory_cache:
+            _memory_cache.move_to_end(content_hash)
+            return _memory_cache[content_hash]
+
+    sidecar = _sidecar_path(content_hash)
+    if not sidecar.exists():
+        return None
+    try:
+        text = sidecar.read_text(encoding="utf-8")
+    except OSError as exc:
+        logger.warning("Could not read resume text cache %s (%s)", sidecar, exc)
+        return None
+    _remember(content_hash, text)
+    return text
+
+
+def _remember(content_hash: str, text: str) -> None:
+    with _memory_lock:
+        _memory_cache[content_hash] = text
+        _memory_cache.move_to_end(content_hash)
+        while len(_memory_cache) > RESUME_TEXT_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+
+def store_cached_text(content_hash: str, text: str) -> None:
+    _remember(content_hash, text)
+    sidecar = _sidecar_path(content_hash)
+    tmp_path = sidecar.with_name(f"{sidecar.name}.{uuid4().hex}.tmp")
+    try:
+        RESUME_TEXT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(text, encoding="utf-8")
+        tmp_path.replace(sidecar)
+    except OSError as exc:
+        logger.warning("Could not write resume text cache %s (%s)", sidecar, exc)
+
+
+def _get_context() -> BaseContext:
+    # forkserver children fork from a clean single-threaded server with pypdf already imported,
+    # so each parse starts in milliseconds without forking the worker's threads.
+    global _mp_context
+    if _mp_context is None:
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            _mp_context = multiprocessing.get_context("forkserver")
+            _mp_context.set_forkserver_preload([__name__, "pypdf"])
+        else:
+            _mp_context = multiprocessing.get_context("spawn")
+    return _mp_context
+
+
+def _parse_pdf_child(sender: Connection, file_path: Path, max_pages: int) -> None:
+    try:
+        result = (True, _parse_pdf(file_path, max_pages))
+    except Exception as exc:
+        result = (False, exc)
+    try:
+        sender.send(result)
+    except Exception:
+        # Unpicklable exception from the parser: keep the message, lose the type.
+        sender.send((False, ValueError(f"{type(result[1]).__name__}: {result[1]}")))
+    finally:
+        sender.close()
+
+
+def _parse_pdf_isolated(file_path: Path, max_pages: int, timeout: float) -> str:
+    """Parse in a dedicated process so a pathological document can be killed on its own."""
+    context = _get_context()
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_parse_pdf_child, args=(sender, file_path, max_pages), daemon=True)
+    try:
+        process.start()
+    except OSError as exc:
+        receiver.close()
+        sender.close()
+        raise ExtractionUnavailable(f"Could not start a PDF parser for {file_path} ({exc})") from exc
+    sender.close()
+    with _live_parsers_lock:
+        _live_parsers.add(process)
+    try:
+        if not receiver.poll(timeout):
+            raise TimeoutError(f"PDF extraction exceeded {timeout}s for {file_path}")
+        try:
+            ok, value = receiver.recv()
+        except EOFError:
+            process.join(1)
+            raise ExtractionUnavailable(
+                f"PDF parser for {file_path} exited with code {process.exitcode}"
+            ) from None
+    finally:
+        if process.is_alive():
+            process.kill()
+        process.join()
+        receiver.close()
+        with _live_parsers_lock:
+            _live_parsers.discard(process)
+    if not ok:
+        raise value
+    return value
+
+
+def _get_parse_slots() -> asyncio.Semaphore:
+    global _parse_slots
+    if _parse_slots is None:
+        _parse_slots = asyncio.Semaphore(PDF_EXTRACT_WORKERS)
+    return _parse_slots
+
+
+def stop_parsers() -> None:
+    # Called on worker shutdown: stop any parse still running.
+    with _live_parsers_lock:
+        processes = list(_live_parsers)
+    for process in processes:
+        if process.is_alive():
+            process.kill()
+
+
+async def load_resume_text_async(file_path: Path, content_hash: Optional[str] = None) -> str:
+    # Raises on unreadable/unparseable files; each distinct file content is parsed at most once.
+    # Parsing runs in its own process, at most PDF_EXTRACT_WORKERS at a time.
+    with timed(PDF_EXTRACT_SECONDS, outcome="error") as labels:
+        content_hash = content_hash or await asyncio.to_thread(file_sha256, file_path)
+        cached = await asyncio.to_thread(get_cached_text, content_hash)
+        if cached is not None:
+            labels["outcome"] = "cache_hit"
+            return cached
+        _check_size(file_path)
+
+        async with _get_parse_slots():
+            try:
+                text = await asyncio.to_thread(
+                    _parse_pdf_isolated, file_path, PDF_MAX_PAGES, PDF_EXTRACT_TIMEOUT_SECONDS
+                )
+            except (ImportError, ExtractionUnavailable):
+                raise
+            except Exception as exc:
+                # Timeouts and parse errors are the document's fault: remember the content as
+                # unreadable so later stages of the same application don't parse it again.
+                if isinstance(exc, TimeoutError):
+                    labels["outcome"] = "timeout"
+                await asyncio.to_thread(store_cached_text, content_hash, "")
+                raise
+
+        await asyncio.to_thread(store_cached_text, content_hash, text)
+        labels["outcome"] = "parsed"
+        return text
+
+
+async def extract_resume_text_async(file_path: Optional[Path], content_hash: Optional[str] = None) -> str:
+    if not file_path:
+        return ""
+    try:
+        return await load_resume_text_async(Path(file_path), content_hash)
+    except ExtractionUnavailable:
+        # Not the document's fault: fail the activity so Temporal retries it rather than
+        # screening the applicant as if they sent no resume.
+        raise
+    except ImportError as exc:
+        logger.warning("pypdf not available for %s (%s)", file_path, exc)
+    except Exception as exc:
+        logger.warning("Failed to extract PDF text from %s (%s)", file_path, exc)
+    return ""
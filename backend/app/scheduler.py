@@ -4,22 +4,26 @@ from datetime import timedelta
 from temporalio.client import (Client, Schedule, ScheduleActionStartWorkflow,
                                ScheduleSpec)
 
-from .config import TEMPORAL_TARGET, TEMPORAL_TASK_QUEUE
+from .config import (NOTIFY_BATCH_SIZE, NOTIFY_MAX_PARALLEL, TEMPORAL_TARGET,
+                     TEMPORAL_TASK_QUEUE)
 from .notification_workflow import NotifyFailedWorkflow
+from .payload_codec import data_converter
 
 
 async def create_schedule() -> None:
-    client = await Client.connect(TEMPORAL_TARGET)
+    client = await Client.connect(TEMPORAL_TARGET, data_converter=data_converter())
 
     spec = ScheduleSpec(
         cron_expressions=["*/1 * * * *"],  
     )
     action = ScheduleActionStartWorkflow(
         workflow=NotifyFailedWorkflow,
-        args=[],
+        args=[{"batch_size": NOTIFY_BATCH_SIZE, "max_parallel": NOTIFY_MAX_PARALLEL}],
         id="notify-failed-workflow",
         task_queue=TEMPORAL_TASK_QUEUE,
-        execution_timeout=timedelta(minutes=5),
+        # Per run, not per chain: the workflow continues-as-new between pages and checks
+        # this deadline before fetching the next one.
+        run_timeout=timedelta(minutes=15),
     )
     sch = Schedule(spec=spec, action=action)
     try:
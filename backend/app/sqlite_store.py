@@ -0,0 +1,37 @@
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+
+def utcnow() -> str:
+    return datetime.utcnow().isoformat() + "Z"
+
+
+class SqliteStore:
+    """One lazily opened WAL-mode connection per store, shared across threads behind `_lock`.
+
+    Subclasses set `schema` and may override `_prepare` for one-off migrations; every query
+    must hold `_lock` and go through `_connect()`.
+    """
+
+    schema = ""
+
+    def __init__(self, db_path: Path) -> None:
+        self._db_path = db_path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self._db_path), check_same_thread=False, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.schema)
+            self._prepare(conn)
+            self._conn = conn
+        return self._conn
+
+    def _prepare(self, conn: sqlite3.Connection) -> None:
+        pass
@@ -1,8 +1,22 @@
+import hashlib
 import json
+import logging
+import re
+import sqlite3
+import threading
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
-from .config import DATA_DIR, FAILED_JSON_PATH, TEMP_JSON_PATH
+from .config import (DATA_DIR, FAILED_JSON_PATH, STORAGE_BACKEND,
+                     STORAGE_DB_PATH, TEMP_JSON_PATH)
+from .metrics import STORAGE_SECONDS, timed
+from .sqlite_store import SqliteStore, utcnow
+
+logger = logging.getLogger(__name__)
+
+
+class SearchUnavailable(RuntimeError):
+    """This SQLite build has no FTS5, so the full-text index could not be created."""
 
 
 def _read_json(path: Path) -> List[Dict]:
@@ -21,31 +35,580 @@ def _write_json(path: Path, entries: List[Dict]) -> None:
         json.dump(entries, handle, indent=2)
 
 
-def append_application_record(record: Dict) -> None:
-    entries = _read_json(TEMP_JSON_PATH)
-    entries.append(record)
-    _write_json(TEMP_JSON_PATH, entries)
+def _decision_and_score(record: Dict) -> Tuple[Optional[str], Optional[int]]:
+    evaluation = (record.get("analysis") or {}).get("evaluation") or {}
+    decision = evaluation.get("decision")
+    score = evaluation.get("score_0_to_100")
+    return (str(decision).lower() if decision else None), (int(score) if isinstance(score, (int, float)) else None)
+
+
+def _record_id(record: Dict) -> str:
+    # Legacy JSON rows predate ids: derive one from everything but the mutable notified_at, so a
+    # row keeps the same id on every read and when it is migrated to SQLite.
+    if record.get("id"):
+        return record["id"]
+    stable = {key: value for key, value in record.items() if key != "notified_at"}
+    digest = hashlib.sha256(json.dumps(stable, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return f"legacy-{digest[:32]}"
+
+
+def _summary(
+    record_id: Optional[str], record: Dict, qualifies: bool, decision: Optional[str], score: Optional[int]
+) -> Dict:
+    analysis = record.get("analysis") or {}
+    return {
+        "id": record_id,
+        "email": record.get("email"),
+        "title": record.get("title"),
+        "source": record.get("source"),
+        "qualifies": qualifies,
+        "decision": decision,
+        "score": score,
+        "reason": analysis.get("reason", ""),
+        "evaluated_at": record.get("evaluated_at"),
+        "notified_at": record.get("notified_at"),
+    }
+
+
+def _parse_cursor(cursor: str) -> int:
+    try:
+        return int(cursor)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from None
+
+
+def _matches(record: Dict, qualifies: bool, decision: Optional[str], score: Optional[int], filters: Dict) -> bool:
+    # In-memory twin of _sql_filters for the JSON backend.
+    evaluated_at = record.get("evaluated_at") or ""
+    checks = (
+        filters.get("qualifies") is None or bool(filters["qualifies"]) == qualifies,
+        not filters.get("decision") or str(filters["decision"]).lower() == decision,
+        filters.get("min_score") is None or (score is not None and score >= int(filters["min_score"])),
+        filters.get("max_score") is None or (score is not None and score <= int(filters["max_score"])),
+        not filters.get("evaluated_after") or evaluated_at >= filters["evaluated_after"],
+        not filters.get("evaluated_before") or evaluated_at < filters["evaluated_before"],
+        not filters.get("email") or str(record.get("email") or "").lower() == str(filters["email"]).lower(),
+        not filters.get("source") or record.get("source") == filters["source"],
+    )
+    return all(checks)
+
+
+class JsonFileBackend:
+    """Legacy backend: every write rewrites the whole JSON array on disk."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def _append(self, path: Path, record: Dict) -> None:
+        with self._lock:
+            entries = _read_json(path)
+            entries.append(record)
+            _write_json(path, entries)
+
+    def append_application(self, record: Dict, resume_text: str = "") -> None:
+        self._append(TEMP_JSON_PATH, record)
+
+    def append_failed(self, record: Dict, resume_text: str = "") -> None:
+        self._append(FAILED_JSON_PATH, record)
+
+    def unnotified_failed(self, limit: Optional[int], cursor: Optional[int]) -> Tuple[List[Dict], Optional[int]]:
+        start = cursor + 1 if cursor is not None else 0
+        rows: List[Dict] = []
+        entries = _read_json(FAILED_JSON_PATH)
+        for index in range(start, len(entries)):
+            if entries[index].get("notified_at"):
+                continue
+            rows.append({**entries[index], "id": _record_id(entries[index])})
+            if limit is not None and len(rows) >= limit:
+                return rows, index
+        return rows, None
+
+    def mark_notified(self, failure_ids: List[str]) -> int:
+        pending = set(failure_ids)
+        updated = 0
+        with self._lock:
+            entries = _read_json(FAILED_JSON_PATH)
+            now = utcnow()
+            for row in entries:
+                if _record_id(row) in pending and not row.get("notified_at"):
+                    row["notified_at"] = now
+                    updated += 1
+            if updated:
+                _write_json(FAILED_JSON_PATH, entries)
+        return updated
+
+    def count_with_id_prefix(self, prefix: str) -> Dict[str, int]:
+        accepted = sum(1 for row in _read_json(TEMP_JSON_PATH) if str(row.get("id", "")).startswith(prefix))
+        failed = sum(1 for row in _read_json(FAILED_JSON_PATH) if str(row.get("id", "")).startswith(prefix))
+        return {"evaluated": accepted + failed, "qualified": accepted}
+
+    def _all_records(self) -> List[Tuple[Dict, bool]]:
+        return [({**row, "id": _record_id(row)}, True) for row in _read_json(TEMP_JSON_PATH)] + [
+            ({**row, "id": _record_id(row)}, False) for row in _read_json(FAILED_JSON_PATH)
+        ]
+
+    def list_applications(self, filters: Dict, limit: int, cursor: Optional[str]) -> Tuple[List[Dict], Optional[str]]:
+        # Full scan on every call; the SQLite backend answers the same query from indexes.
+        items = []
+        for record, qualifies in self._all_records():
+            decision, score = _decision_and_score(record)
+            if _matches(record, qualifies, decision, score, filters):
+                items.append(_summary(record["id"], record, qualifies, decision, score))
+        items.sort(key=lambda item: item["evaluated_at"] or "", reverse=True)
+        offset = _parse_cursor(cursor) if cursor else 0
+        next_cursor = str(offset + limit) if offset + limit < len(items) else None
+        return items[offset:offset + limit], next_cursor
+
+    def get_application(self, record_id: str) -> Optional[Dict]:
+        for record, qualifies in self._all_records():
+            if record["id"] == record_id:
+                decision, score = _decision_and_score(record)
+                return {**record, "qualifies": qualifies, "decision": decision, "score": score}
+        return None
+
+    def search(
+        self, terms: List[str], skills: List[str], match_all: bool, qualifies: Optional[bool], limit: int, offset: int
+    ) -> List[Dict]:
+        # Full scan of the form fields and extracted skills; resume text is only indexed by SQLite.
+        hits = []
+        for record, flag in self._all_records():
+            if qualifies is not None and flag != qualifies:
+                continue
+            hit = _scan_record(record, terms, skills, match_all)
+            if hit is None:
+                continue
+            decision, score = _decision_and_score(record)
+            hits.append({**_summary(record["id"], record, flag, decision, score), **hit})
+        hits.sort(key=lambda item: item["rank"], reverse=True)
+        return hits[offset:offset + limit]
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    qualifies INTEGER NOT NULL,
+    email TEXT,
+    evaluated_at TEXT,
+    notified_at TEXT,
+    record TEXT NOT NULL,
+    decision TEXT,
+    score INTEGER,
+    source TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_applications_pending
+    ON applications (seq) WHERE qualifies = 0 AND notified_at IS NULL;
+CREATE TABLE IF NOT EXISTS migrations (
+    source TEXT PRIMARY KEY,
+    imported_rows INTEGER NOT NULL,
+    imported_at TEXT NOT NULL
+);
+"""
+
+# Filter columns added after the first release: (name, type, backfill expression over `record`).
+_FILTER_COLUMNS = (
+    ("decision", "TEXT", "lower(json_extract(record, '$.analysis.evaluation.decision'))"),
+    ("score", "INTEGER", "CAST(json_extract(record, '$.analysis.evaluation.score_0_to_100') AS INTEGER)"),
+    ("source", "TEXT", "json_extract(record, '$.source')"),
+)
+
+# Full-text index over skills, form fields and resume text; rowid is applications.seq.
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE applications_fts USING fts5(
+    skills, title, description, resume, tokenize = 'porter unicode61'
+);
+INSERT INTO applications_fts (rowid, skills, title, description, resume)
+SELECT seq,
+       (SELECT group_concat(value, ', ') FROM json_each(record, '$.analysis.candidate_profile.skills')),
+       json_extract(record, '$.title'),
+       json_extract(record, '$.description'),
+       ''
+FROM applications;
+"""
+# bm25 column weights, in _FTS_SCHEMA column order: a skill hit outranks a passing mention.
+_FTS_WEIGHTS = (4.0, 2.0, 1.0, 1.0)
+
+# Every read-API filter has a (column, seq) index, so filtered pages are index range scans.
+_READ_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_applications_qualifies ON applications (qualifies, seq);
+CREATE INDEX IF NOT EXISTS idx_applications_decision ON applications (decision, seq);
+CREATE INDEX IF NOT EXISTS idx_applications_score ON applications (score, seq);
+CREATE INDEX IF NOT EXISTS idx_applications_source ON applications (source, seq);
+CREATE INDEX IF NOT EXISTS idx_applications_email ON applications (email COLLATE NOCASE, seq);
+CREATE INDEX IF NOT EXISTS idx_applications_evaluated ON applications (evaluated_at, seq);
+"""
+
+
+class SqliteBackend(SqliteStore):
+    """Append-only SQLite store in WAL mode; each append is a single-row insert."""
+
+    schema = _SQLITE_SCHEMA
+
+    def __init__(self, db_path: Path) -> None:
+        super().__init__(db_path)
+        self._imported: Dict[str, int] = {}
+        self._fts = False
+
+    def _prepare(self, conn: sqlite3.Connection) -> None:
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self._add_filter_columns(conn)
+        conn.executescript(_READ_INDEXES)
+        self._fts = self._ensure_fts(conn)
+        self._imported = self._migrate_json(conn)
+
+    def _add_filter_columns(self, conn: sqlite3.Connection) -> None:
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(applications)")}
+        with conn:
+            for name, column_type, backfill in _FILTER_COLUMNS:
+                if name not in existing:
+                    conn.execute(f"ALTER TABLE applications ADD COLUMN {name} {column_type}")
+                    conn.execute(f"UPDATE applications SET {name} = {backfill}")
+
+    def _ensure_fts(self, conn: sqlite3.Connection) -> bool:
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'applications_fts'").fetchone():
+            return True
+        try:
+            # Existing rows are indexed without resume text, which was never stored.
+            conn.executescript(f"BEGIN; {_FTS_SCHEMA} COMMIT;")
+        except sqlite3.OperationalError as exc:
+            if conn.in_transaction:
+                conn.rollback()
+            logger.warning("SQLite FTS5 unavailable (%s); full-text search is disabled", exc)
+            return False
+        return True
+
+    def _insert(self, conn: sqlite3.Connection, record: Dict, qualifies: bool, resume_text: str = "") -> None:
+        if not record.get("id"):
+            # Legacy JSON rows have no id; store the derived one in the record too.
+            record = {**record, "id": _record_id(record)}
+        decision, score = _decision_and_score(record)
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO applications "
+            "(id, qualifies, email, evaluated_at, notified_at, record, decision, score, source) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                record["id"],
+                int(qualifies),
+                record.get("email"),
+                record.get("evaluated_at"),
+                record.get("notified_at"),
+                json.dumps(record),
+                decision,
+                score,
+                record.get("source"),
+            ),
+        )
+        if cursor.rowcount and self._fts:
+            skills = ((record.get("analysis") or {}).get("candidate_profile") or {}).get("skills") or []
+            conn.execute(
+                "INSERT INTO applications_fts (rowid, skills, title, description, resume) VALUES (?, ?, ?, ?, ?)",
+                (
+                    cursor.lastrowid,
+                    ", ".join(str(skill) for skill in skills),
+                    record.get("title") or "",
+                    record.get("description") or "",
+                    resume_text,
+                ),
+            )
+
+    def _migrate_json(self, conn: sqlite3.Connection) -> Dict[str, int]:
+        imported: Dict[str, int] = {}
+        for path, qualifies in ((TEMP_JSON_PATH, True), (FAILED_JSON_PATH, False)):
+            source = path.name
+            if not path.exists():
+                continue
+            if conn.execute("SELECT 1 FROM migrations WHERE source = ?", (source,)).fetchone():
+                continue
+            rows = _read_json(path)
+            with conn:
+                for row in rows:
+                    self._insert(conn, row, qualifies)
+                conn.execute(
+                    "INSERT INTO migrations (source, imported_rows, imported_at) VALUES (?, ?, ?)",
+                    (source, len(rows), utcnow()),
+                )
+            imported[source] = len(rows)
+        return imported
+
+    def migrate(self) -> Dict[str, int]:
+        with self._lock:
+            self._connect()
+        return dict(self._imported)
+
+    def _append(self, record: Dict, qualifies: bool, resume_text: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                self._insert(conn, record, qualifies, resume_text)
+
+    def append_application(self, record: Dict, resume_text: str = "") -> None:
+        self._append(record, True, resume_text)
+
+    def append_failed(self, record: Dict, resume_text: str = "") -> None:
+        self._append(record, False, resume_text)
+
+    def unnotified_failed(self, limit: Optional[int], cursor: Optional[int]) -> Tuple[List[Dict], Optional[int]]:
+        # Served from the partial pending index, so cost tracks the pending set, not history.
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT seq, record FROM applications "
+                "WHERE qualifies = 0 AND notified_at IS NULL AND seq > ? ORDER BY seq LIMIT ?",
+                (cursor or 0, limit if limit is not None else -1),
+            ).fetchall()
+        next_cursor = rows[-1][0] if rows and limit is not None and len(rows) >= limit else None
+        return [json.loads(row[1]) for row in rows], next_cursor
+
+    def mark_notified(self, failure_ids: List[str]) -> int:
+        if not failure_ids:
+            return 0
+        now = utcnow()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                cursor = conn.execute(
+                    "UPDATE applications SET notified_at = ?, record = json_set(record, '$.notified_at', ?) "
+                    "WHERE id IN (SELECT value FROM json_each(?)) AND notified_at IS NULL",
+                    (now, now, json.dumps(sorted(set(failure_ids)))),
+                )
+        return cursor.rowcount
+
+    def count_with_id_prefix(self, prefix: str) -> Dict[str, int]:
+        # Range scan on the unique id index; ids sharing a prefix sort together.
+        with self._lock:
+            evaluated, qualified = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(qualifies), 0) FROM applications WHERE id >= ? AND id < ?",
+                (prefix, prefix + "\uffff"),
+            ).fetchone()
+        return {"evaluated": evaluated, "qualified": qualified}
+
+    def list_applications(self, filters: Dict, limit: int, cursor: Optional[str]) -> Tuple[List[Dict], Optional[str]]:
+        # Keyset pagination, newest first: the cursor is the last seq already returned.
+        clauses, params = _sql_filters(filters)
+        if cursor:
+            clauses.append("seq < ?")
+            params.append(_parse_cursor(cursor))
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT seq, id, qualifies, decision, score, record FROM applications {where}ORDER BY seq DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        items = [
+            _summary(record_id, json.loads(record), bool(qualifies), decision, score)
+            for _, record_id, qualifies, decision, score, record in rows
+        ]
+        next_cursor = str(rows[-1][0]) if len(rows) >= limit else None
+        return items, next_cursor
+
+    def get_application(self, record_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT qualifies, decision, score, record FROM applications WHERE id = ?", (record_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        qualifies, decision, score, record = row
+        return {**json.loads(record), "id": record_id, "qualifies": bool(qualifies), "decision": decision, "score": score}
+
+    def search(
+        self, terms: List[str], skills: List[str], match_all: bool, qualifies: Optional[bool], limit: int, offset: int
+    ) -> List[Dict]:
+        match = fts_match_expression(terms, skills, match_all)
+        with self._lock:
+            conn = self._connect()
+            if not self._fts:
+                raise SearchUnavailable("Full-text search needs SQLite with FTS5.")
+            weights = ", ".join(str(weight) for weight in _FTS_WEIGHTS)
+            rows = conn.execute(
+                "SELECT a.id, a.qualifies, a.decision, a.score, a.record, "
+                f"bm25(applications_fts, {weights}) AS rank, "
+                "snippet(applications_fts, -1, '[', ']', '...', 12) "
+                "FROM applications_fts JOIN applications AS a ON a.seq = applications_fts.rowid "
+                "WHERE applications_fts MATCH ? AND (? IS NULL OR a.qualifies = ?) "
+                "ORDER BY rank LIMIT ? OFFSET ?",
+                (match, qualifies, qualifies, limit, offset),
+            ).fetchall()
+        return [
+            {
+                **_summary(record_id, json.loads(record), bool(flag), decision, score),
+                "rank": round(-rank, 4),
+                "snippet": snippet,
+            }
+            for record_id, flag, decision, score, record, rank, snippet in rows
+        ]
+
+
+_SEARCH_TERM = re.compile(r"[\w.+#-]+\*?")
+_SNIPPET_CHARS = 80
+
+
+def search_terms(text: str) -> List[str]:
+    # A trailing * marks a prefix term.
+    return [term for term in _SEARCH_TERM.findall(text or "") if term.strip("*")]
+
+
+def fts_match_expression(terms: List[str], skills: List[str], match_all: bool = True) -> str:
+    """Build an FTS5 query: free-text terms (all or any) plus required skills, user input always quoted."""
+
+    def phrase(term: str) -> str:
+        prefix = term.endswith("*")
+        term = term.rstrip("*").replace('"', '""')
+        return f'"{term}"' + (" *" if prefix else "")
+
+    parts = []
+    if terms:
+        parts.append("(" + (" AND " if match_all else " OR ").join(phrase(term) for term in terms) + ")")
+    parts.extend(f"skills : {phrase(skill)}" for skill in skills)
+    if not parts:
+        raise ValueError("Search needs a query or at least one skill.")
+    return " AND ".join(parts)
+
+
+def _term_pattern(term: str) -> "re.Pattern[str]":
+    prefix = term.endswith("*")
+    return re.compile(r"(?<!\w)" + re.escape(term.rstrip("*")) + (r"\w*" if prefix else r"(?!\w)"), re.IGNORECASE)
+
+
+def _scan_record(record: Dict, terms: List[str], skills: List[str], match_all: bool) -> Optional[Dict]:
+    # JSON-backend twin of the FTS query: same columns and weights, plain word matching (no stemming).
+    analysis = record.get("analysis") or {}
+    skill_text = ", ".join(str(skill) for skill in (analysis.get("candidate_profile") or {}).get("skills") or [])
+    columns = (skill_text, record.get("title") or "", record.get("description") or "")
+    if not all(_term_pattern(skill).search(skill_text) for skill in skills):
+        return None
+    patterns = [_term_pattern(term) for term in terms]
+    found = [any(pattern.search(text) for text in columns) for pattern in patterns]
+    if patterns and not (all(found) if match_all else any(found)):
+        return None
+    patterns = patterns or [_term_pattern(skill) for skill in skills]
+    rank = sum(
+        weight * len(pattern.findall(text)) for weight, text in zip(_FTS_WEIGHTS, columns) for pattern in patterns
+    )
+    return {"rank": float(rank), "snippet": _scan_snippet(columns, patterns)}
+
+
+def _scan_snippet(columns: Tuple[str, ...], patterns: List["re.Pattern[str]"]) -> str:
+    # Text around the first hit in the highest-weighted matching column, hits in [brackets].
+    for text in columns:
+        starts = [match.start() for match in (pattern.search(text) for pattern in patterns) if match]
+        if starts:
+            first = min(starts)
+            window = text[max(0, first - _SNIPPET_CHARS // 2):first + _SNIPPET_CHARS]
+            for pattern in patterns:
+                window = pattern.sub(lambda match: f"[{match.group(0)}]", window)
+            return window
+    return ""
+
+
+def _sql_filters(filters: Dict) -> Tuple[List[str], List]:
+    # Each filter maps onto a column indexed in _READ_INDEXES.
+    clauses: List[str] = []
+    params: List = []
+
+    def add(clause: str, value) -> None:
+        clauses.append(clause)
+        params.append(value)
+
+    if filters.get("qualifies") is not None:
+        add("qualifies = ?", int(bool(filters["qualifies"])))
+    if filters.get("decision"):
+        add("decision = ?", str(filters["decision"]).lower())
+    if filters.get("min_score") is not None:
+        add("score >= ?", int(filters["min_score"]))
+    if filters.get("max_score") is not None:
+        add("score <= ?", int(filters["max_score"]))
+    if filters.get("evaluated_after"):
+        add("evaluated_at >= ?", filters["evaluated_after"])
+    if filters.get("evaluated_before"):
+        add("evaluated_at < ?", filters["evaluated_before"])
+    if filters.get("email"):
+        add("email = ? COLLATE NOCASE", filters["email"])
+    if filters.get("source"):
+        add("source = ?", filters["source"])
+    return clauses, params
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        if STORAGE_BACKEND == "json":
+            _backend = JsonFileBackend()
+        elif STORAGE_BACKEND == "sqlite":
+            _backend = SqliteBackend(STORAGE_DB_PATH)
+        else:
+            raise ValueError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND!r}")
+    return _backend
+
+
+def append_application_record(record: Dict, resume_text: str = "") -> None:
+    # resume_text only feeds the search index; it is not kept in the record.
+    with timed(STORAGE_SECONDS, operation="append_application"):
+        get_backend().append_application(record, resume_text)
+
+
+def append_failed_record(record: Dict, resume_text: str = "") -> None:
+    with timed(STORAGE_SECONDS, operation="append_failed"):
+        get_backend().append_failed(record, resume_text)
+
+
+def get_unnotified_failed(limit: Optional[int] = None, cursor: Optional[int] = None) -> List[Dict]:
+    rows, _ = get_backend().unnotified_failed(limit, cursor)
+    return rows
+
+
+def get_unnotified_failed_page(limit: int, cursor: Optional[int] = None) -> Dict:
+    with timed(STORAGE_SECONDS, operation="unnotified_failed"):
+        rows, next_cursor = get_backend().unnotified_failed(limit, cursor)
+    return {"rows": rows, "next_cursor": next_cursor}
+
+
+def mark_failed_notified(failure_ids: List[str]) -> int:
+    with timed(STORAGE_SECONDS, operation="mark_notified"):
+        return get_backend().mark_notified(failure_ids)
+
+
+def count_records_with_id_prefix(prefix: str) -> Dict[str, int]:
+    return get_backend().count_with_id_prefix(prefix)
+
+
+def list_applications(filters: Dict, limit: int, cursor: Optional[str] = None) -> Dict:
+    with timed(STORAGE_SECONDS, operation="list_applications"):
+        items, next_cursor = get_backend().list_applications(filters, limit, cursor)
+    return {"items": items, "next_cursor": next_cursor}
+
 
+def get_application(record_id: str) -> Optional[Dict]:
+    with timed(STORAGE_SECONDS, operation="get_application"):
+        return get_backend().get_application(record_id)
 
-def append_failed_record(record: Dict) -> None:
-    entries = _read_json(FAILED_JSON_PATH)
-    entries.append(record)
-    _write_json(FAILED_JSON_PATH, entries)
 
+def search_applications(
+    query: str,
+    skills: List[str],
+    match_all: bool = True,
+    qualifies: Optional[bool] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> Dict:
+    terms = search_terms(query)
+    skills = [skill.strip() for skill in skills if skill.strip()]
+    if not terms and not skills:
+        raise ValueError("Search needs a query or at least one skill.")
+    with timed(STORAGE_SECONDS, operation="search"):
+        items = get_backend().search(terms, skills, match_all, qualifies, limit, offset)
+    next_cursor = str(offset + limit) if len(items) >= limit else None
+    return {"items": items, "next_cursor": next_cursor}
 
-def get_unnotified_failed() -> List[Dict]:
-    return [row for row in _read_json(FAILED_JSON_PATH) if not row.get("notified_at")]
 
+def migrate_json_files() -> Dict[str, int]:
+    backend = get_backend()
+    if not isinstance(backend, SqliteBackend):
+        return {}
+    return backend.migrate()
 
-def mark_failed_notified(failure_ids: List[str]) -> None:
-    entries = _read_json(FAILED_JSON_PATH)
-    updated: List[Dict] = []
-    for row in entries:
-        if row.get("id") in failure_ids and not row.get("notified_at"):
-            row["notified_at"] = row.get("notified_at") or None
-            if row["notified_at"] is None:
-                from datetime import datetime
 
-                row["notified_at"] = datetime.utcnow().isoformat() + "Z"
-        updated.append(row)
-    _write_json(FAILED_JSON_PATH, updated)
+if __name__ == "__main__":
+    print(f"Imported legacy JSON rows: {migrate_json_files()}")
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from temporalio.client import Client, WorkflowHandle
+from temporalio.service import RPCError, RPCStatusCode
+
+from .payload_codec import data_converter
+
+logger = logging.getLogger(__name__)
+
+# Starts (or confirms) one workflow: (workflow_id, payload).
+StartFn = Callable[[str, Dict], Awaitable[None]]
+
+_RECONNECT_STATUSES = {RPCStatusCode.UNAVAILABLE, RPCStatusCode.UNKNOWN, RPCStatusCode.CANCELLED}
+# Failures that say nothing about the request itself; it should simply be tried again later.
+_TRANSIENT_STATUSES = _RECONNECT_STATUSES | {RPCStatusCode.DEADLINE_EXCEEDED, RPCStatusCode.RESOURCE_EXHAUSTED}
+
+
+def is_unavailable(exc: BaseException) -> bool:
+    if isinstance(exc, RPCError):
+        return exc.status in _TRANSIENT_STATUSES
+    return isinstance(exc, (ConnectionError, TimeoutError, asyncio.TimeoutError))
+
+
+class SharedTemporalClient:
+    """One Temporal client per process, connected lazily and replaced when the connection drops."""
+
+    def __init__(self, target: str, reconnect_cooldown: float = 2.0) -> None:
+        self.target = target
+        self._reconnect_cooldown = reconnect_cooldown
+        self._client: Optional[Client] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._last_error: Optional[str] = None
+        self._last_attempt = 0.0
+        self._connects = 0
+
+    async def get(self) -> Client:
+        if self._client is not None:
+            return self._client
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._client is not None:
+                return self._client
+            if self._last_error and time.monotonic() - self._last_attempt < self._reconnect_cooldown:
+                # Fail fast during an outage instead of queueing a dial per request.
+                raise ConnectionError(f"Temporal unavailable at {self.target}: {self._last_error}")
+            self._last_attempt = time.monotonic()
+            try:
+                self._client = await Client.connect(self.target, data_converter=data_converter())
+            except Exception as exc:
+                self._last_error = str(exc)
+                raise ConnectionError(f"Temporal unavailable at {self.target}: {exc}") from exc
+            self._connects += 1
+            self._last_error = None
+            logger.info("Connected to Temporal at %s", self.target)
+            return self._client
+
+    def reset(self, error: Optional[BaseException] = None) -> None:
+        if error is not None:
+            self._last_error = str(error)
+        self._client = None
+
+    async def start_workflow(self, *args: Any, **kwargs: Any) -> WorkflowHandle:
+        client = await self.get()
+        try:
+            return await client.start_workflow(*args, **kwargs)
+        except RPCError as exc:
+            if exc.status not in _RECONNECT_STATUSES:
+                raise
+            logger.warning("Temporal connection lost (%s); reconnecting", exc)
+            self.reset(exc)
+        client = await self.get()
+        return await client.start_workflow(*args, **kwargs)
+
+    async def health(self, timeout: float = 2.0) -> Dict[str, Any]:
+        status: Dict[str, Any] = {
+            "target": self.target,
+            "connected": self._client is not None,
+            "connects": self._connects,
+            "last_error": self._last_error,
+        }
+        if self._client is None:
+            status["serving"] = False
+            return status
+        try:
+            status["serving"] = await self._client.service_client.check_health(
+                timeout=timedelta(seconds=timeout)
+            )
+        except Exception as exc:
+            status["serving"] = False
+            status["last_error"] = str(exc)
+        return status
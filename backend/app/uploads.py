@@ -0,0 +1,59 @@
+import hashlib
+from pathlib import Path
+from typing import BinaryIO, Optional, Tuple
+
+from .config import MAX_UPLOAD_BYTES, UPLOAD_DIR
+
+PDF_MAGIC = b"%PDF-"
+UPLOAD_CHUNK_BYTES = 256 * 1024
+
+
+class UploadRejected(Exception):
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def copy_stream(
+    source: BinaryIO,
+    destination: Path,
+    max_bytes: int,
+    magic: Optional[bytes] = None,
+) -> Tuple[str, int]:
+    # Chunked copy that hashes as it goes and stops as soon as the size cap is crossed.
+    digest = hashlib.sha256()
+    size = 0
+    with open(destination, "wb") as handle:
+        if magic is not None:
+            header = source.read(len(magic))
+            if header != magic:
+                raise UploadRejected(400, "Only PDF files are accepted.")
+            digest.update(header)
+            size = len(header)
+            handle.write(header)
+        for chunk in iter(lambda: source.read(UPLOAD_CHUNK_BYTES), b""):
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadRejected(413, f"File exceeds the {max_bytes} byte upload limit.")
+            digest.update(chunk)
+            handle.write(chunk)
+    return digest.hexdigest(), size
+
+
+def copy_pdf(source: BinaryIO, destination: Path) -> Tuple[str, int]:
+    try:
+        return copy_stream(source, destination, MAX_UPLOAD_BYTES, magic=PDF_MAGIC)
+    except BaseException:
+        destination.unlink(missing_ok=True)
+        raise
+
+
+def store_content_addressed(staged: Path, content_hash: str) -> Path:
+    # Identical resumes share one file on disk; the staged copy is dropped if it already exists.
+    destination = UPLOAD_DIR / f"{content_hash}.pdf"
+    if destination.exists():
+        staged.unlink(missing_ok=True)
+    else:
+        staged.replace(destination)
+    return destination
@@ -1,37 +1,180 @@
+import argparse
 import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
 
 from temporalio.client import Client
+from temporalio.runtime import PrometheusConfig, Runtime, TelemetryConfig
 from temporalio.worker import Worker
 
 from .activities import (
     evaluate_application,
+    evaluate_applications_batch,
+    evaluate_candidate,
+    fallback_screen_application,
     fetch_unnotified_failed,
+    intake_application,
     mark_failed_as_notified,
+    prepare_application,
+    record_evaluation,
     send_applicant_email,
     send_failed_email,
+    send_failed_emails_batch,
 )
-from .config import TEMPORAL_TARGET, TEMPORAL_TASK_QUEUE
+from .config import (EXTRACT_MAX_CONCURRENT_ACTIVITIES, PDF_EXTRACT_WORKERS,
+                     TEMPORAL_EXTRACT_TASK_QUEUE, TEMPORAL_METRICS_BIND,
+                     TEMPORAL_TARGET, TEMPORAL_TASK_QUEUE,
+                     WORKER_ACTIVITY_TASK_POLLERS, WORKER_ACTIVITY_THREADS,
+                     WORKER_INDEX, WORKER_MAX_CONCURRENT_ACTIVITIES,
+                     WORKER_MAX_CONCURRENT_WORKFLOW_TASKS, WORKER_METRICS_PORT,
+                     WORKER_PROCESSES, WORKER_ROLE,
+                     WORKER_WORKFLOW_TASK_POLLERS)
+from .metrics import start_metrics_server
 from .notification_workflow import NotifyFailedWorkflow
-from .workflows import ApplicationWorkflow
-
-
-async def main() -> None:
-    client = await Client.connect(TEMPORAL_TARGET)
-    worker = Worker(
-        client,
-        task_queue=TEMPORAL_TASK_QUEUE,
-        workflows=[ApplicationWorkflow, NotifyFailedWorkflow],
-        activities=[
-            evaluate_application,
-            send_applicant_email,
-            send_failed_email,
-            fetch_unnotified_failed,
-            mark_failed_as_notified,
-        ],
+from .payload_codec import data_converter
+from .resume_text import stop_parsers
+from .workflows import ApplicationWorkflow, BatchScreeningWorkflow
+
+ROLES = ("all", "io", "extract")
+
+# LLM, storage and email work: waits on the network, so many can be in flight per process.
+IO_ACTIVITIES = [
+    evaluate_application,
+    evaluate_applications_batch,
+    intake_application,
+    evaluate_candidate,
+    fallback_screen_application,
+    record_evaluation,
+    send_applicant_email,
+    send_failed_email,
+    send_failed_emails_batch,
+    fetch_unnotified_failed,
+    mark_failed_as_notified,
+]
+# PDF parsing: bounded by PDF_EXTRACT_WORKERS parser processes in resume_text.
+EXTRACT_ACTIVITIES = [prepare_application]
+
+
+# Worker N serves metrics on base + METRICS_PORT_STRIDE * N for each port family, so with the
+# default adjacent bases (9464/9465) the two families interleave and never collide.
+METRICS_PORT_STRIDE = 2
+
+
+def _metrics_port(index: int) -> int:
+    return WORKER_METRICS_PORT + METRICS_PORT_STRIDE * index if WORKER_METRICS_PORT else 0
+
+
+def _temporal_metrics_port(index: int) -> int:
+    if not TEMPORAL_METRICS_BIND:
+        return 0
+    return int(TEMPORAL_METRICS_BIND.rpartition(":")[2]) + METRICS_PORT_STRIDE * index
+
+
+def _check_metrics_ports(processes: int) -> None:
+    worker_ports = {_metrics_port(index) for index in range(processes)}
+    temporal_ports = {_temporal_metrics_port(index) for index in range(processes)}
+    clash = sorted((worker_ports & temporal_ports) - {0})
+    if clash:
+        raise SystemExit(
+            f"WORKER_METRICS_PORT and TEMPORAL_METRICS_BIND give {processes} workers overlapping ports {clash}; "
+            f"use bases an odd number apart or at least {METRICS_PORT_STRIDE * processes} apart."
+        )
+
+
+def _temporal_runtime() -> Runtime:
+    # SDK-level metrics (poll latency, task slots, schedule-to-start) on their own endpoint.
+    if not TEMPORAL_METRICS_BIND:
+        return Runtime.default()
+    host = TEMPORAL_METRICS_BIND.rpartition(":")[0]
+    bind_address = f"{host}:{_temporal_metrics_port(WORKER_INDEX)}"
+    return Runtime(telemetry=TelemetryConfig(metrics=PrometheusConfig(bind_address=bind_address)))
+
+
+def build_workers(client: Client, role: str = "all") -> List[Worker]:
+    workers: List[Worker] = []
+    if role in ("all", "io"):
+        workers.append(
+            Worker(
+                client,
+                task_queue=TEMPORAL_TASK_QUEUE,
+                workflows=[ApplicationWorkflow, BatchScreeningWorkflow, NotifyFailedWorkflow],
+                activities=IO_ACTIVITIES,
+                max_concurrent_activities=WORKER_MAX_CONCURRENT_ACTIVITIES,
+                max_concurrent_workflow_tasks=WORKER_MAX_CONCURRENT_WORKFLOW_TASKS,
+                max_concurrent_workflow_task_polls=WORKER_WORKFLOW_TASK_POLLERS,
+                max_concurrent_activity_task_polls=WORKER_ACTIVITY_TASK_POLLERS,
+            )
+        )
+    if role in ("all", "extract"):
+        workers.append(
+            Worker(
+                client,
+                task_queue=TEMPORAL_EXTRACT_TASK_QUEUE,
+                activities=EXTRACT_ACTIVITIES,
+                max_concurrent_activities=EXTRACT_MAX_CONCURRENT_ACTIVITIES,
+                max_concurrent_activity_task_polls=WORKER_ACTIVITY_TASK_POLLERS,
+            )
+        )
+    return workers
+
+
+async def main(role: str = WORKER_ROLE) -> None:
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=WORKER_ACTIVITY_THREADS, thread_name_prefix="activity")
     )
-    print(f"Worker listening on task queue '{TEMPORAL_TASK_QUEUE}' against {TEMPORAL_TARGET}")
-    await worker.run()
+    if WORKER_METRICS_PORT:
+        start_metrics_server(_metrics_port(WORKER_INDEX))
+    client = await Client.connect(TEMPORAL_TARGET, runtime=_temporal_runtime(), data_converter=data_converter())
+    workers = build_workers(client, role)
+    queues = ", ".join(f"'{worker.config()['task_queue']}'" for worker in workers)
+    print(f"Worker {WORKER_INDEX} ({role}) listening on {queues} against {TEMPORAL_TARGET}")
+    try:
+        await asyncio.gather(*(worker.run() for worker in workers))
+    finally:
+        stop_parsers()
+
+
+def launch(processes: int, role: str) -> int:
+    """Run `processes` worker processes and stop them all when any exits or on SIGINT/SIGTERM."""
+    env = dict(os.environ)
+    # Each child runs its own PDF parser processes; split the cores between them unless set explicitly.
+    env.setdefault("PDF_EXTRACT_WORKERS", str(max(1, PDF_EXTRACT_WORKERS // processes)))
+    children = [
+        subprocess.Popen(
+            [sys.executable, "-m", "app.worker", "--processes", "1", "--role", role],
+            env={**env, "WORKER_INDEX": str(index)},
+        )
+        for index in range(processes)
+    ]
+
+    def stop(*_: object) -> None:
+        for child in children:
+            if child.poll() is None:
+                child.terminate()
 
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    try:
+        while all(child.poll() is None for child in children):
+            time.sleep(1)
+    finally:
+        stop()
+        for child in children:
+            child.wait()
+    return next((child.returncode for child in children if child.returncode), 0)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Run Temporal workers for the screening pipeline.")
+    parser.add_argument("--processes", type=int, default=WORKER_PROCESSES, help="worker processes to launch")
+    parser.add_argument("--role", choices=ROLES, default=WORKER_ROLE,
+                        help="io: workflows + LLM/email activities, extract: PDF parsing, all: both")
+    args = parser.parse_args()
+    _check_metrics_ports(max(1, args.processes))
+    if args.processes > 1:
+        sys.exit(launch(args.processes, args.role))
+    asyncio.run(main(args.role))
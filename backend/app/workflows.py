@@ -1,33 +1,145 @@
 from datetime import timedelta
-from typing import Dict
+from typing import Dict, List, Optional
 
 from temporalio import workflow
+from temporalio.common import RetryPolicy
+from temporalio.exceptions import ActivityError
+
+with workflow.unsafe.imports_passed_through():
+    from .config import TEMPORAL_EXTRACT_TASK_QUEUE
+
+STAGE_RETRY = RetryPolicy(initial_interval=timedelta(seconds=2), maximum_attempts=3)
+DEFAULT_SCREENING_BATCH_SIZE = 10
+PASSED_SCREEN_SUBJECT = "Thanks for applying — you passed the initial screen"
+
+
+def _passed_screen_email(email: str, reason: str) -> Dict:
+    return {
+        "email": email,
+        "subject": PASSED_SCREEN_SUBJECT,
+        "body": (
+            "Hi,\n\n"
+            "Your application appears to meet our senior full-stack criteria. "
+            "We'll be in touch with next steps.\n\n"
+            f"Reason: {reason}\n"
+        ),
+    }
 
 
 @workflow.defn
 class ApplicationWorkflow:
+    async def _evaluate_in_stages(self, payload: Dict) -> Dict:
+        # Each stage is its own activity, so a retry only redoes the stage that failed and the
+        # candidate profile from intake is checkpointed in history before evaluation starts.
+        # PDF parsing is CPU-bound, so it runs on workers polling the extraction queue.
+        extract_queue = TEMPORAL_EXTRACT_TASK_QUEUE if workflow.patched("extract-task-queue") else None
+        prepare_options = dict(
+            task_queue=extract_queue,
+            start_to_close_timeout=timedelta(minutes=2),
+            retry_policy=STAGE_RETRY,
+        )
+        try:
+            prepared = await workflow.execute_activity("prepare_application", payload, **prepare_options)
+        except ActivityError as exc:
+            if not workflow.patched("unreadable-on-prepare-failure"):
+                raise
+            # Every attempt to extract the resume failed (e.g. the parser crashed each time):
+            # screen the application as having an unreadable resume instead of losing it.
+            workflow.logger.warning("Resume extraction failed, treating resume as unreadable: %s", exc)
+            prepared = await workflow.execute_activity(
+                "prepare_application", {**payload, "resume_unreadable": True}, **prepare_options
+            )
+        stage_payload = {**payload, "resume_sha256": prepared.get("content_hash")}
+        # A pre-screen verdict or a cached result means no model call is needed.
+        analysis: Optional[Dict] = prepared.get("prescreen_analysis") or prepared.get("cached_analysis")
+
+        if analysis is None and prepared.get("llm_enabled"):
+            try:
+                candidate_profile = await workflow.execute_activity(
+                    "intake_application",
+                    stage_payload,
+                    start_to_close_timeout=timedelta(minutes=2),
+                    retry_policy=STAGE_RETRY,
+                )
+                analysis = await workflow.execute_activity(
+                    "evaluate_candidate",
+                    {**stage_payload, "candidate_profile": candidate_profile},
+                    start_to_close_timeout=timedelta(minutes=2),
+                    retry_policy=STAGE_RETRY,
+                )
+            except ActivityError as exc:
+                workflow.logger.warning("ADK screening failed, using fallback screen: %s", exc)
+
+        if analysis is None:
+            analysis = await workflow.execute_activity(
+                "fallback_screen_application",
+                stage_payload,
+                start_to_close_timeout=timedelta(minutes=2),
+                retry_policy=STAGE_RETRY,
+            )
+
+        await workflow.execute_activity(
+            "record_evaluation",
+            {
+                "application": payload,
+                "analysis": analysis,
+                "cache_key": prepared.get("cache_key"),
+                "record_id": workflow.info().workflow_id,
+            },
+            start_to_close_timeout=timedelta(minutes=1),
+        )
+        return analysis
+
     @workflow.run
     async def run(self, payload: Dict) -> Dict:
-        analysis = await workflow.execute_activity(
-            "evaluate_application",
-            payload,
-            schedule_to_close_timeout=timedelta(minutes=5),
-        )
+        if workflow.patched("staged-evaluation"):
+            analysis = await self._evaluate_in_stages(payload)
+        else:
+            analysis = await workflow.execute_activity(
+                "evaluate_application",
+                payload,
+                schedule_to_close_timeout=timedelta(minutes=5),
+            )
         email_result = None
         if analysis.get("qualifies"):
-            email_payload = {
-                "email": payload["email"],
-                "subject": "Thanks for applying — you passed the initial screen",
-                "body": (
-                    "Hi,\n\n"
-                    "Your application appears to meet our senior full-stack criteria. "
-                    "We'll be in touch with next steps.\n\n"
-                    f"Reason: {analysis.get('reason','')}\n"
-                ),
-            }
             email_result = await workflow.execute_activity(
                 "send_applicant_email",
-                email_payload,
+                _passed_screen_email(payload["email"], analysis.get("reason", "")),
                 schedule_to_close_timeout=timedelta(minutes=2),
             )
         return {"analysis": analysis, "email": email_result}
+
+
+@workflow.defn
+class BatchScreeningWorkflow:
+    @workflow.run
+    async def run(self, payload: Dict) -> Dict:
+        applications: List[Dict] = payload.get("applications", [])
+        batch_size = max(1, int(payload.get("batch_size", DEFAULT_SCREENING_BATCH_SIZE)))
+        workflow_id = workflow.info().workflow_id
+        summary = {"evaluated": 0, "qualified": 0, "batched": 0, "emailed": 0}
+
+        for start in range(0, len(applications), batch_size):
+            chunk = applications[start:start + batch_size]
+            response = await workflow.execute_activity(
+                "evaluate_applications_batch",
+                {
+                    "applications": chunk,
+                    "record_ids": [f"{workflow_id}-{start + offset}" for offset in range(len(chunk))],
+                },
+                start_to_close_timeout=timedelta(minutes=5),
+                retry_policy=STAGE_RETRY,
+            )
+            for result in response.get("results", []):
+                summary["evaluated"] += 1
+                summary["batched"] += int(result.get("batched", False))
+                if not result.get("qualifies"):
+                    continue
+                summary["qualified"] += 1
+                email_result = await workflow.execute_activity(
+                    "send_applicant_email",
+                    _passed_screen_email(result["email"], result.get("reason", "")),
+                    schedule_to_close_timeout=timedelta(minutes=2),
+                )
+                summary["emailed"] += int(bool(email_result.get("sent")))
+        return summary
@@ -0,0 +1,54 @@
+import asyncio
+import io
+import zipfile
+
+import pytest
+
+pytest.importorskip("fastapi")
+httpx = pytest.importorskip("httpx")
+
+from app import bulk_ingest, main  # noqa: E402
+from app.bulk_ingest import INTERRUPTED_ERROR, BulkBatchTracker  # noqa: E402
+
+
+def test_interrupted_batches_are_marked_failed(tmp_path):
+    tracker = BulkBatchTracker(tmp_path / "bulk.db")
+    tracker.create("running")
+    tracker.create("done")
+    tracker.update("done", "ingested", bulk_ingest._new_progress())
+
+    assert tracker.fail_interrupted() == 1
+
+    running = tracker.get("running")
+    assert running["status"] == "failed"
+    assert running["errors"] == [{"row": None, "error": INTERRUPTED_ERROR}]
+    assert tracker.get("done")["status"] == "ingested"
+    assert tracker.fail_interrupted() == 0
+
+
+def _zip_bytes() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("manifest.csv", "email,file\n")
+    return buffer.getvalue()
+
+
+def test_rejected_manifest_removes_the_staged_archive(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(main, "BULK_MAX_MANIFEST_BYTES", 4)
+
+    async def post():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(
+                "/api/applications/bulk",
+                files={
+                    "archive": ("batch.zip", _zip_bytes(), "application/zip"),
+                    "manifest": ("manifest.csv", b"email,file\na@example.com,a.pdf\n", "text/csv"),
+                },
+            )
+
+    response = asyncio.run(post())
+
+    assert response.status_code == 413
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+
+genai = pytest.importorskip("google.generativeai")
+
+from app import adk_client  # noqa: E402
+
+
+class RequestBuilt(Exception):
+    pass
+
+
+class CapturingClient:
+    """Stands in for the transport: the SDK has already built and validated the request."""
+
+    def __init__(self) -> None:
+        self.requests = []
+
+    async def generate_content(self, request, **_):
+        self.requests.append(request)
+        raise RequestBuilt
+
+
+def test_gemini_request_is_accepted_by_the_installed_sdk(monkeypatch):
+    # Runs against the google-generativeai version pinned in requirements.txt.
+    model = genai.GenerativeModel("models/gemini-pro")
+    client = CapturingClient()
+    model._async_client = client
+    monkeypatch.setattr(adk_client, "_get_gemini_model", lambda: model)
+
+    with pytest.raises(RequestBuilt):
+        asyncio.run(adk_client._gemini_generate(["instructions", "materials"]))
+    assert len(client.requests) == 1
@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("temporalio")
+
+from temporalio.testing import ActivityEnvironment  # noqa: E402
+
+from app import activities, emailer  # noqa: E402
+
+ROWS = [{"id": "a", "email": "a@example.com"}, {"id": "b", "email": "b@example.com"}]
+
+
+def test_unconfigured_smtp_counts_every_message_as_failed(monkeypatch):
+    monkeypatch.setattr(emailer, "SMTP_HOST", "")
+
+    result = asyncio.run(ActivityEnvironment().run(activities.send_failed_emails_batch, {"rows": ROWS}))
+
+    assert result == {"sent_ids": [], "attempts": 2, "failed": 2}
+
+
+def test_unreachable_smtp_counts_unsent_messages_as_failed(monkeypatch):
+    for name, value in [("SMTP_HOST", "smtp.test"), ("SMTP_PORT", 25), ("SMTP_USERNAME", "u"),
+                        ("SMTP_PASSWORD", "p"), ("SMTP_FROM", "jobs@example.com")]:
+        monkeypatch.setattr(emailer, name, value)
+
+    def refuse():
+        raise OSError("connection refused")
+
+    monkeypatch.setattr(emailer, "_open_smtp", refuse)
+
+    result = asyncio.run(ActivityEnvironment().run(activities.send_failed_emails_batch, {"rows": ROWS}))
+
+    assert result == {"sent_ids": [], "attempts": 2, "failed": 2}
@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("temporalio")
+
+from temporalio.exceptions import (ActivityError, ApplicationError,  # noqa: E402
+                                   TimeoutError, TimeoutType)
+
+from app.notification_workflow import _heartbeated_sent_ids  # noqa: E402
+
+
+def _activity_error(cause: BaseException) -> ActivityError:
+    error = ActivityError(
+        "activity failed",
+        scheduled_event_id=5,
+        started_event_id=6,
+        identity="worker",
+        activity_type="send_failed_emails_batch",
+        activity_id="1",
+        retry_state=None,
+    )
+    error.__cause__ = cause
+    return error
+
+
+def test_timed_out_batch_reports_heartbeated_sends():
+    timeout = TimeoutError(
+        "activity timeout",
+        type=TimeoutType.SCHEDULE_TO_CLOSE,
+        last_heartbeat_details=[{"done": 2, "sent_ids": ["a", "b"], "failed": 0}],
+    )
+
+    assert _heartbeated_sent_ids(_activity_error(timeout)) == ["a", "b"]
+
+
+def test_failed_batch_without_heartbeat_reports_nothing():
+    timeout = TimeoutError("activity timeout", type=TimeoutType.HEARTBEAT, last_heartbeat_details=[])
+
+    assert _heartbeated_sent_ids(_activity_error(timeout)) == []
+    assert _heartbeated_sent_ids(_activity_error(ApplicationError("boom"))) == []
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("temporalio")
+
+from temporalio.converter import default  # noqa: E402
+
+from app.payload_codec import (CLAIM_CHECK_ENCODING, ZLIB_ENCODING,  # noqa: E402
+                               BlobStore, ScreeningPayloadCodec)
+
+RESUME = {"email": "jane@example.com", "resume_text": "React and Node.js services. " * 400}
+
+
+def _round_trip(codec, value):
+    payloads = default().payload_converter.to_payloads([value])
+    encoded = asyncio.run(codec.encode(payloads))
+    decoded = asyncio.run(codec.decode(encoded))
+    return encoded[0], default().payload_converter.from_payloads(decoded)[0]
+
+
+def test_small_payloads_pass_through(tmp_path):
+    codec = ScreeningPayloadCodec(BlobStore(tmp_path), 1024, 64 * 1024)
+
+    encoded, value = _round_trip(codec, {"email": "jane@example.com"})
+
+    assert encoded.metadata["encoding"] == b"json/plain"
+    assert value == {"email": "jane@example.com"}
+
+
+def test_large_payloads_are_compressed(tmp_path):
+    codec = ScreeningPayloadCodec(BlobStore(tmp_path), 1024, 64 * 1024)
+
+    encoded, value = _round_trip(codec, RESUME)
+
+    assert encoded.metadata["encoding"] == ZLIB_ENCODING
+    assert value == RESUME
+    assert not any(tmp_path.iterdir())
+
+
+def test_payloads_past_the_claim_check_threshold_go_to_the_blob_store(tmp_path):
+    codec = ScreeningPayloadCodec(BlobStore(tmp_path), 1024, 100)
+
+    encoded, value = _round_trip(codec, RESUME)
+
+    assert encoded.metadata["encoding"] == CLAIM_CHECK_ENCODING
+    assert len(encoded.data) == 64
+    assert value == RESUME
+    # The stored blob is the compressed payload, not the raw JSON.
+    (blob,) = [path for path in tmp_path.rglob("*") if path.is_file()]
+    assert blob.stat().st_size < len(RESUME["resume_text"])
+
+
+def test_corrupt_blob_is_rejected(tmp_path):
+    store = BlobStore(tmp_path)
+    digest = store.put(b"payload")
+    store._path(digest).write_bytes(b"tampered")
+
+    with pytest.raises(ValueError):
+        store.get(digest)
@@ -0,0 +1,80 @@
+import pytest
+
+from app import prescreen as prescreen_module
+from app.prescreen import keyword_screen, missing_skills, prescreen, score_text, years_of_experience
+
+
+@pytest.mark.parametrize(
+    "text, missing",
+    [
+        ("React.js and Node.js", []),
+        ("ReactJS, NodeJS", []),
+        ("react-js with node", []),
+        ("Preact and nodemon", ["react", "node"]),
+        ("Reactive systems, Node", ["react"]),
+    ],
+)
+def test_missing_skills_match_whole_words_only(text, missing):
+    assert missing_skills(text) == missing
+
+
+def test_years_of_experience_takes_the_largest_mention():
+    assert years_of_experience("2 years at A, then 7+ yrs at B") == 7
+    assert years_of_experience("no dates here") is None
+
+
+def test_score_combines_skills_and_seniority():
+    assert score_text("")["score"] == 0
+    assert score_text("React")["score"] == 0.35
+    assert score_text("Senior engineer, React and Node.js")["score"] == 1.0
+    assert score_text("5 years of React and Node")["senior_signal"] is True
+    assert score_text("1 year of React and Node")["senior_signal"] is False
+
+
+def test_clear_mismatch_is_rejected_without_the_model():
+    result = prescreen("Accountant with Excel skills", "resume.pdf")
+
+    assert result["prescreen"]["decision"] == "reject"
+    analysis = result["analysis"]
+    assert analysis["qualifies"] is False
+    assert analysis["prescreened"] is True
+    assert analysis["missing_keywords"] == ["react", "node"]
+    assert analysis["file_path"] == "resume.pdf"
+    assert "no senior-level signal" in analysis["reason"]
+
+
+def test_borderline_application_goes_to_the_model():
+    result = prescreen("Junior React developer")
+
+    assert result["prescreen"]["decision"] == "llm"
+    assert result["analysis"] is None
+
+
+def test_accept_is_off_unless_configured(monkeypatch):
+    strong = "Senior engineer, React and Node.js"
+    assert prescreen(strong)["prescreen"]["decision"] == "llm"
+
+    monkeypatch.setattr(prescreen_module, "PRESCREEN_ACCEPT_AT", 0.9)
+    result = prescreen(strong)
+    assert result["prescreen"]["decision"] == "accept"
+    assert result["analysis"]["qualifies"] is True
+
+
+def test_unreadable_resume_always_defers_to_the_model():
+    result = prescreen("Accountant", "resume.pdf", resume_unreadable=True)
+
+    assert result["prescreen"]["decision"] == "llm"
+    assert result["prescreen"]["resume_unreadable"] is True
+    assert result["analysis"] is None
+
+
+def test_disabled_prescreen_defers_to_the_model(monkeypatch):
+    monkeypatch.setattr(prescreen_module, "PRESCREEN_ENABLED", False)
+
+    assert prescreen("Accountant")["prescreen"]["decision"] == "llm"
+
+
+def test_keyword_screen_needs_every_skill_and_seniority():
+    assert keyword_screen("Senior React and Node.js engineer")["qualifies"] is True
+    assert keyword_screen("React and Node.js engineer")["qualifies"] is False
+    assert keyword_screen("Senior React engineer")["missing_keywords"] == ["node"]
@@ -0,0 +1,51 @@
+from app.prompt_builder import (TRUNCATION_MARK, build_application_prompt,
+                                cap_tokens, condense_resume, condense_text)
+from app.resume_text import PAGE_BREAK
+
+
+def test_condense_text_normalizes_whitespace_and_drops_boilerplate():
+    text = "Curriculum Vitae\n\nJane  Doe\t \n\n\n\nReact   and Node\nPage 1 of 2\n\n"
+
+    assert condense_text(text, 100) == "Jane Doe\n\nReact and Node"
+
+
+def test_cap_tokens_cuts_at_a_line_break_and_marks_the_cut():
+    text = "\n".join(f"line {index}" for index in range(100))
+
+    capped = cap_tokens(text, 10)
+
+    assert len(capped) <= 40 + 1
+    assert capped.endswith("\n" + TRUNCATION_MARK)
+    assert capped.splitlines()[:-1] == text.splitlines()[: len(capped.splitlines()) - 1]
+    assert cap_tokens(text, 0) == text
+    assert cap_tokens("short", 10) == "short"
+
+
+def test_repeated_headers_and_footers_are_kept_once():
+    pages = [
+        f"Jane Doe - Senior Engineer\n\nExperience at company {index}\nBuilt React apps\n"
+        f"Shipped Node.js services\nPage {index} of 3\njane@example.com"
+        for index in range(1, 4)
+    ]
+
+    condensed = condense_resume(PAGE_BREAK.join(pages), 1000)
+
+    assert condensed.count("Jane Doe - Senior Engineer") == 1
+    assert condensed.count("jane@example.com") == 1
+    assert condensed.count("Built React apps") == 3
+    assert "Page" not in condensed
+
+
+def test_bare_numbers_are_dropped_only_at_page_edges():
+    pages = ["1\nYears of experience\n10\nReact\n- 1 -", "2\nNode\n2"]
+
+    condensed = condense_resume(PAGE_BREAK.join(pages), 1000)
+
+    assert condensed.splitlines() == ["Years of experience", "10", "React", "Node"]
+
+
+def test_prompt_omits_the_resume_section_when_there_is_no_text():
+    prompt = build_application_prompt("Senior engineer", "React and Node", "")
+
+    assert prompt == "Title: Senior engineer\n\nDescription:\nReact and Node"
+    assert "Resume:\nSkills: React" in build_application_prompt("t", "d", "Skills: React")
@@ -0,0 +1,51 @@
+import asyncio
+from collections import OrderedDict
+
+import pytest
+
+from app import resume_text
+
+
+@pytest.fixture
+def parser(monkeypatch, tmp_path):
+    monkeypatch.setattr(resume_text, "RESUME_TEXT_CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(resume_text, "_memory_cache", OrderedDict())
+    calls = []
+
+    def install(error):
+        def parse(file_path, max_pages, timeout):
+            calls.append(file_path)
+            raise error
+
+        monkeypatch.setattr(resume_text, "_parse_pdf_isolated", parse)
+        return calls
+
+    return install
+
+
+def _resume(tmp_path):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(b"%PDF-1.4 not really a pdf")
+    return path
+
+
+@pytest.mark.parametrize("error", [TimeoutError("too slow"), ValueError("bad xref")])
+def test_failed_parse_is_cached_as_unreadable(parser, tmp_path, error):
+    calls = parser(error)
+    path = _resume(tmp_path)
+
+    assert asyncio.run(resume_text.extract_resume_text_async(path, "abc")) == ""
+    assert asyncio.run(resume_text.extract_resume_text_async(path, "abc")) == ""
+    assert len(calls) == 1
+    assert resume_text.get_cached_text("abc") == ""
+
+
+def test_unavailable_parser_is_not_cached(parser, tmp_path):
+    calls = parser(resume_text.ExtractionUnavailable("parser died"))
+    path = _resume(tmp_path)
+
+    for _ in range(2):
+        with pytest.raises(resume_text.ExtractionUnavailable):
+            asyncio.run(resume_text.extract_resume_text_async(path, "abc"))
+    assert len(calls) == 2
+    assert resume_text.get_cached_text("abc") is None
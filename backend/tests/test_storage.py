@@ -0,0 +1,166 @@
+import json
+import sqlite3
+
+import pytest
+
+from app import storage
+
+
+@pytest.fixture
+def json_files(monkeypatch, tmp_path):
+    accepted, failed = tmp_path / "temp.json", tmp_path / "failed.json"
+    monkeypatch.setattr(storage, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(storage, "TEMP_JSON_PATH", accepted)
+    monkeypatch.setattr(storage, "FAILED_JSON_PATH", failed)
+    return accepted, failed
+
+
+def _record(email, decision, score, evaluated_at, **extra):
+    return {
+        "email": email,
+        "title": "Senior engineer",
+        "description": "React and Node.js",
+        "evaluated_at": evaluated_at,
+        "analysis": {"reason": "", "evaluation": {"decision": decision, "score_0_to_100": score}},
+        **extra,
+    }
+
+
+def test_json_backend_gives_legacy_rows_a_stable_id(json_files):
+    accepted, failed = json_files
+    accepted.write_text(json.dumps([_record("old@example.com", "accept", 90, "2024-01-01T00:00:00Z")]))
+    failed.write_text(json.dumps([_record("gone@example.com", "reject", 10, "2024-01-02T00:00:00Z")]))
+    backend = storage.JsonFileBackend()
+
+    items, _ = backend.list_applications({}, 10, None)
+    ids = {item["email"]: item["id"] for item in items}
+    assert all(ids.values())
+    assert backend.get_application(ids["old@example.com"])["email"] == "old@example.com"
+
+    # Marking a legacy row as notified must not change its id.
+    rows, _ = backend.unnotified_failed(None, None)
+    assert [row["id"] for row in rows] == [ids["gone@example.com"]]
+    assert backend.mark_notified([ids["gone@example.com"]]) == 1
+    assert backend.get_application(ids["gone@example.com"])["notified_at"]
+    assert backend.unnotified_failed(None, None) == ([], None)
+
+
+def test_migrated_legacy_rows_keep_their_json_backend_id(json_files, tmp_path):
+    accepted, _ = json_files
+    accepted.write_text(json.dumps([_record("old@example.com", "accept", 90, "2024-01-01T00:00:00Z")]))
+    (legacy_id,) = [item["id"] for item in storage.JsonFileBackend().list_applications({}, 10, None)[0]]
+
+    backend = storage.SqliteBackend(tmp_path / "applications.db")
+
+    assert backend.get_application(legacy_id)["email"] == "old@example.com"
+
+
+def test_json_files_are_migrated_once(json_files, tmp_path):
+    accepted, failed = json_files
+    accepted.write_text(json.dumps([_record("a@example.com", "accept", 90, "2024-01-01T00:00:00Z", id="a")]))
+    failed.write_text(
+        json.dumps(
+            [
+                _record("b@example.com", "reject", 10, "2024-01-02T00:00:00Z", id="b"),
+                _record("c@example.com", "reject", 20, "2024-01-03T00:00:00Z", id="c", notified_at="2024-01-04"),
+            ]
+        )
+    )
+    db_path = tmp_path / "applications.db"
+
+    backend = storage.SqliteBackend(db_path)
+    assert backend.migrate() == {"temp.json": 1, "failed.json": 2}
+    assert backend.get_application("a")["qualifies"] is True
+    assert [row["id"] for row in backend.unnotified_failed(None, None)[0]] == ["b"]
+
+    # A later start must not import the same files again.
+    failed.write_text(json.dumps([_record("d@example.com", "reject", 5, "2024-01-05T00:00:00Z", id="d")]))
+    reopened = storage.SqliteBackend(db_path)
+    assert reopened.migrate() == {}
+    assert reopened.get_application("d") is None
+    assert reopened.count_with_id_prefix("") == {"evaluated": 3, "qualified": 1}
+
+
+def test_mark_notified_only_touches_pending_failures(json_files, tmp_path):
+    backend = storage.SqliteBackend(tmp_path / "applications.db")
+    backend.append_failed(_record("b@example.com", "reject", 10, "2024-01-02T00:00:00Z", id="b"))
+    backend.append_failed(_record("c@example.com", "reject", 20, "2024-01-03T00:00:00Z", id="c"))
+
+    assert backend.mark_notified(["b", "b", "unknown"]) == 1
+    assert backend.mark_notified(["b"]) == 0
+    assert backend.get_application("b")["notified_at"]
+    assert [row["id"] for row in backend.unnotified_failed(None, None)[0]] == ["c"]
+
+
+def _seeded(tmp_path):
+    backend = storage.SqliteBackend(tmp_path / "applications.db")
+    backend.append_application(_record("a@example.com", "accept", 90, "2024-01-01T00:00:00Z", id="a", source="web"))
+    backend.append_failed(_record("b@example.com", "reject", 30, "2024-01-02T00:00:00Z", id="b", source="bulk"))
+    backend.append_application(_record("C@example.com", "Accept", 75, "2024-01-03T00:00:00Z", id="c", source="bulk"))
+    backend.append_failed(_record("d@example.com", "reject", 55, "2024-01-04T00:00:00Z", id="d", source="web"))
+    return backend
+
+
+@pytest.mark.parametrize(
+    "filters, expected",
+    [
+        ({}, ["d", "c", "b", "a"]),
+        ({"qualifies": True}, ["c", "a"]),
+        ({"decision": "ACCEPT"}, ["c", "a"]),
+        ({"min_score": 55, "max_score": 80}, ["d", "c"]),
+        ({"evaluated_after": "2024-01-02", "evaluated_before": "2024-01-04"}, ["c", "b"]),
+        ({"email": "c@EXAMPLE.com"}, ["c"]),
+        ({"source": "bulk", "qualifies": False}, ["b"]),
+    ],
+)
+def test_filters_match_between_backends(json_files, tmp_path, filters, expected):
+    backend = _seeded(tmp_path)
+    accepted, failed = json_files
+    accepted.write_text(json.dumps([backend.get_application(i) for i in ("a", "c")]))
+    failed.write_text(json.dumps([backend.get_application(i) for i in ("b", "d")]))
+
+    assert [item["id"] for item in backend.list_applications(filters, 10, None)[0]] == expected
+    assert [item["id"] for item in storage.JsonFileBackend().list_applications(filters, 10, None)[0]] == expected
+
+
+def test_pages_follow_the_keyset_cursor(json_files, tmp_path):
+    backend = _seeded(tmp_path)
+
+    first, cursor = backend.list_applications({}, 3, None)
+    second, last_cursor = backend.list_applications({}, 3, cursor)
+
+    assert [item["id"] for item in first] == ["d", "c", "b"]
+    assert [item["id"] for item in second] == ["a"]
+    assert last_cursor is None
+    with pytest.raises(ValueError):
+        backend.list_applications({}, 3, "not-a-cursor")
+
+
+def test_filter_columns_are_backfilled_on_an_older_database(json_files, tmp_path):
+    db_path = tmp_path / "applications.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript(
+        """
+        CREATE TABLE applications (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT NOT NULL UNIQUE,
+            qualifies INTEGER NOT NULL,
+            email TEXT,
+            evaluated_at TEXT,
+            notified_at TEXT,
+            record TEXT NOT NULL
+        );
+        """
+    )
+    record = _record("a@example.com", "Accept", 90, "2024-01-01T00:00:00Z", id="a", source="web")
+    conn.execute(
+        "INSERT INTO applications (id, qualifies, email, evaluated_at, record) VALUES (?, 1, ?, ?, ?)",
+        ("a", record["email"], record["evaluated_at"], json.dumps(record)),
+    )
+    conn.commit()
+    conn.close()
+
+    backend = storage.SqliteBackend(db_path)
+
+    (item,) = backend.list_applications({"decision": "accept", "min_score": 90, "source": "web"}, 10, None)[0]
+    assert (item["id"], item["decision"], item["score"]) == ("a", "accept", 90)